@@ -3,150 +3,576 @@ Advanced AI Features Module
 Handles document summarization, translation, sentiment analysis, code generation, and debugging
 """
 
+import os
+import importlib.util
 import logging
-from typing import Dict, Optional, List
+import hashlib
+import threading
+import time
+from concurrent.futures import CancelledError, Future
+from functools import lru_cache
+from typing import Any, Dict, Optional, List, Iterator, Union, Tuple
 import json
 
+from groq_agent import GROQ_ERRORS
+
 logger = logging.getLogger(__name__)
 
+# Semantic response caching (paraphrased repeats)
+try:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+    SEMANTIC_CACHE_AVAILABLE = True
+except ImportError:
+    SEMANTIC_CACHE_AVAILABLE = False
+    logger.warning("sentence-transformers not installed. AI response cache will use exact matches only.")
+
+# Persistent response cache shared across restarts and worker processes
+try:
+    from diskcache import Cache
+    DISK_CACHE_AVAILABLE = True
+except ImportError:
+    DISK_CACHE_AVAILABLE = False
+    logger.warning("diskcache not installed. AI responses will only be cached in memory.")
+
+_DISK_CACHE_DIR = os.environ.get('LLM_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'llm_cache'))
+_DISK = None
+if DISK_CACHE_AVAILABLE:
+    try:
+        _DISK = Cache(_DISK_CACHE_DIR, size_limit=2 << 30)
+    except Exception as e:
+        logger.error(f"Error opening AI response disk cache: {e}")
+
+# Token-aware input truncation
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+    logger.warning("tiktoken not installed. Long inputs will be truncated by characters.")
+
+# Errors from a Groq task call that are reported back to the user
+_TASK_ERRORS = GROQ_ERRORS + (KeyError,)
+
+# Fixed instructions, sent as the system message so every call shares a cacheable prefix
+SUMMARIZE_SYSTEM = """You are a document summarizer. Write a concise, faithful summary of the text \
+the user sends, in approximately the number of words they ask for. Reply with the summary only."""
+
+TRANSLATE_SYSTEM = """You are a professional translator. Translate the text the user sends from the \
+given source language to the given target language. Reply with the translation only."""
+
+SENTIMENT_SYSTEM = """Analyze the sentiment of the text the user sends. Respond with:
+- Sentiment: positive, negative, or neutral
+- Confidence: high, medium, or low
+- Brief explanation"""
+
+GENERATE_CODE_SYSTEM = """You are an expert programmer. Generate code in the requested language for \
+the task the user describes. Provide complete, working code with comments."""
+
+DEBUG_SYSTEM = """You are a debugging assistant. Help debug the code the user sends, using the error \
+message if one is provided. Identify issues and suggest fixes."""
+
+# Local sentiment model for short texts (transformers is slow to import, so only
+# check for it here; AdvancedAIModule.warm_up loads it during app start-up)
+LOCAL_SENTIMENT_AVAILABLE = importlib.util.find_spec('transformers') is not None
+if not LOCAL_SENTIMENT_AVAILABLE:
+    logger.warning("transformers not installed. All sentiment analysis will use Groq.")
+
+LOCAL_SENTIMENT_MODEL = "distilbert-base-uncased-finetuned-sst-2-english"
+LOCAL_SENTIMENT_MAX_CHARS = 200
+# The model only knows positive/negative; below this score its label is reported as neutral
+LOCAL_SENTIMENT_NEUTRAL_BELOW = 0.75
+# Model score -> the high/medium/low confidence Groq reports (first band the score reaches)
+LOCAL_SENTIMENT_CONFIDENCE = ((0.98, 'high'), (0.9, 'medium'), (0.0, 'low'))
+_LOCAL_SENTIMENT_EXPLANATIONS = {
+    'positive': "The wording is predominantly positive.",
+    'negative': "The wording is predominantly negative.",
+    'neutral': "The wording is mixed or factual, with no clear lean either way.",
+}
+
+
+@lru_cache(maxsize=None)
+def _get_local_sentiment():
+    """Load the local sentiment pipeline once and reuse it (None if unavailable)"""
+    if not LOCAL_SENTIMENT_AVAILABLE:
+        return None
+    try:
+        from transformers import pipeline
+        return pipeline("sentiment-analysis", model=LOCAL_SENTIMENT_MODEL)
+    except Exception as e:
+        logger.error(f"Error loading local sentiment model: {e}")
+        return None
+
+# Input budget for summarization, in tokens (or characters without tiktoken)
+SUMMARIZE_MAX_TOKENS = 3500
+SUMMARIZE_MAX_CHARS = 4000
+
+
+@lru_cache(maxsize=None)
+def _get_encoding():
+    """Load the tokenizer once and reuse it (None if unavailable)"""
+    if not TIKTOKEN_AVAILABLE:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.error(f"Error loading tokenizer: {e}")
+        return None
+
+
+def truncate_tokens(text: str, max_tokens: int, max_chars: int) -> str:
+    """Trim text to max_tokens, falling back to max_chars without a tokenizer"""
+    enc = _get_encoding()
+    if enc is None:
+        return text[:max_chars]
+    tokens = enc.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return enc.decode(tokens[:max_tokens])
+
+def _validate(params: Dict, key: str, purpose: str, max_chars: Optional[int] = None,
+              strip: bool = True) -> Tuple[str, Optional[str]]:
+    """Return (value, None), or ('', error message) if it is missing or blank"""
+    value = params.get(key) or ''
+    if not isinstance(value, str):
+        value = str(value)
+    stripped = value.strip()
+    if not stripped:
+        return '', f"Error: No {key} provided for {purpose}"
+    # Code keeps its leading indentation
+    value = stripped if strip else value
+    if max_chars is not None:
+        value = value[:max_chars]
+    return value, None
+
+# User message templates, built once at import and filled per call
+_SUMMARIZE_TMPL = "Length: approximately {max_length} words\n\nText:\n{text}"
+_TRANSLATE_TMPL = "From: {source_language}\nTo: {target_language}\n\n{text}"
+_SENTIMENT_TMPL = "Text: {text}"
+_GENERATE_CODE_TMPL = "Language: {language}\n\nTask:\n{description}"
+_DEBUG_CODE_TMPL = "Code:\n```python\n{code}\n```"
+
+
+@lru_cache(maxsize=32)
+def _code_context(code: str) -> str:
+    """Code message for debug_code, built once per distinct file and reused verbatim"""
+    # Sent as its own message ahead of the error, so iterating on one file keeps
+    # the system + code prefix byte-identical for Groq's prompt caching
+    return _DEBUG_CODE_TMPL.format_map({'code': code})
+
+
+class SemanticCache:
+    """TTL cache of LLM responses with exact-hash and embedding-similarity lookup"""
+    
+    EMBEDDING_MODEL = 'all-MiniLM-L6-v2'
+    
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._exact: Dict[tuple, tuple] = {}    # (namespace, md5) -> (expires_at, response)
+        self._vectors: Dict[tuple, list] = {}   # namespace -> [(embedding, expires_at, response), ...]
+        self._model: Any = None
+        self._lock = threading.Lock()
+    
+    def _embed(self, text: str):
+        """Embed text with a lazily loaded MiniLM model (normalized for cosine)"""
+        if self._model is None:
+            self._model = SentenceTransformer(self.EMBEDDING_MODEL)
+        return self._model.encode(text, normalize_embeddings=True)
+    
+    def get(self, namespace: tuple, text: str, threshold: float) -> Optional[str]:
+        """Return a cached response for text, or None on a miss"""
+        now = time.time()
+        digest = hashlib.md5(text.encode('utf-8')).hexdigest()
+        
+        with self._lock:
+            hit = self._exact.get((namespace, digest))
+            if hit and hit[0] > now:
+                return hit[1]
+            entries = [e for e in self._vectors.get(namespace, []) if e[1] > now]
+            self._vectors[namespace] = entries
+        
+        if not SEMANTIC_CACHE_AVAILABLE or not entries:
+            return None
+        
+        try:
+            query = self._embed(text)
+            scores = np.stack([e[0] for e in entries]) @ query
+            best = int(np.argmax(scores))
+            if scores[best] >= threshold:
+                return entries[best][2]
+        except Exception as e:
+            logger.warning(f"Semantic cache lookup failed: {e}")
+        return None
+    
+    def set(self, namespace: tuple, text: str, response: str, ttl: int):
+        """Store a response under both the exact hash and its embedding"""
+        expires_at = time.time() + ttl
+        digest = hashlib.md5(text.encode('utf-8')).hexdigest()
+        
+        with self._lock:
+            if len(self._exact) >= self.max_entries:
+                self._exact.pop(next(iter(self._exact)))
+            self._exact[(namespace, digest)] = (expires_at, response)
+        
+        if not SEMANTIC_CACHE_AVAILABLE:
+            return
+        
+        try:
+            embedding = self._embed(text)
+        except Exception as e:
+            logger.warning(f"Semantic cache insert failed: {e}")
+            return
+        
+        with self._lock:
+            entries = self._vectors.setdefault(namespace, [])
+            entries.append((embedding, expires_at, response))
+            del entries[:-self.max_entries]
+
+
 class AdvancedAIModule:
     """Handles advanced AI-powered features"""
     
-    def __init__(self, groq_agent=None, memory_module=None):
+    # Per-method similarity thresholds for the semantic tier. Only free-text tasks whose
+    # answer survives a paraphrase are listed: code, debugging and translation differ
+    # when a single token does, so those use exact keys only
+    CACHE_THRESHOLDS = {
+        'summarize': 0.92,
+        'sentiment': 0.88,
+    }
+    CACHE_TTL = 3600
+    DISK_CACHE_TTL = 86400
+    # Entries kept in the exact-repeat tier
+    RECENT_MAX_ENTRIES = 512
+    
+    def __init__(self, groq_agent: Any = None, memory_module: Any = None):
         self.groq_agent = groq_agent
         self.memory_module = memory_module
+        self.cache = SemanticCache()
+        # Local sentiment pipeline, set by warm_up; until then Groq answers
+        self._sentiment_model: Any = None
+        # Exact-repeat tier in front of the disk and semantic caches: key -> (expires_at, response)
+        self._recent: Dict[tuple, Tuple[float, str]] = {}
+        self._recent_lock = threading.Lock()
+        # Identical calls already waiting on Groq, keyed by prompt digest
+        self._in_flight: Dict[bytes, Future] = {}
+        self._in_flight_lock = threading.Lock()
+    
+    def _ask(self, namespace: str, text: str, prompt: str, exact: tuple = (),
+             system: Optional[str] = None, context: Optional[str] = None) -> str:
+        """
+        Query Groq through the response caches
+        
+        Args:
+            namespace: Cache namespace (one per method)
+            text: Free-form user input, cache key (matched semantically for CACHE_THRESHOLDS methods)
+            prompt: User message sent to Groq on a cache miss
+            exact: Parameters that must match exactly (length, target language...)
+            system: Fixed instructions sent ahead of the prompt
+            context: Optional reusable message sent between system and prompt
+        """
+        exact = tuple(str(value) for value in exact)
+        key = self._cache_key(namespace, text, exact)
+        
+        # Single-flight: duplicates wait on the first caller instead of calling Groq again
+        flight_key, future, leader = self._join_flight(namespace, prompt, system, context)
+        if leader:
+            try:
+                future.set_result(self._query(key, namespace, text, prompt, exact, system, context))
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                with self._in_flight_lock:
+                    del self._in_flight[flight_key]
+        
+        return future.result()
+    
+    def _join_flight(self, namespace: str, prompt: str, system: Optional[str],
+                     context: Optional[str]) -> Tuple[bytes, Future, bool]:
+        """(flight key, future, leader): the leader must resolve the future and drop the key"""
+        flight_key = hashlib.md5(f"{namespace}\0{system or ''}\0{context or ''}\0{prompt}".encode('utf-8')).digest()
+        with self._in_flight_lock:
+            existing = self._in_flight.get(flight_key)
+            if existing is not None:
+                return flight_key, existing, False
+            future: Future = Future()
+            self._in_flight[flight_key] = future
+        return flight_key, future, True
+    
+    def _cache_key(self, namespace: str, text: str, exact: tuple) -> tuple:
+        """Exact-tier (and disk) key for a request"""
+        digest = hashlib.md5(text.encode('utf-8')).hexdigest()
+        return (self.__class__.__name__, namespace, digest) + exact
+    
+    def _disk_key(self, key: tuple, system: Optional[str]) -> tuple:
+        """Persistent key: instructions can change between releases, so they are part of it"""
+        return key + (hashlib.md5((system or '').encode('utf-8')).hexdigest(),)
+    
+    def _lookup(self, key: tuple, namespace: str, text: str, exact: tuple,
+                system: Optional[str]) -> Optional[str]:
+        """Exact, disk, then semantic cache lookup; None on a miss"""
+        with self._recent_lock:
+            hit = self._recent.get(key)
+            if hit is not None and hit[0] <= time.time():
+                del self._recent[key]
+                hit = None
+        if hit is not None:
+            return hit[1]
+        
+        cached = None
+        if _DISK is not None:
+            cached = _DISK.get(self._disk_key(key, system))
+        threshold = self.CACHE_THRESHOLDS.get(namespace)
+        if cached is None and threshold is not None:
+            cached = self.cache.get((namespace,) + exact, text, threshold)
+        if cached is not None:
+            self._remember(key, cached)
+        return cached
+    
+    def _remember(self, key: tuple, response: str):
+        """Put a response in the exact-repeat tier for CACHE_TTL seconds"""
+        with self._recent_lock:
+            self._recent.pop(key, None)
+            if len(self._recent) >= self.RECENT_MAX_ENTRIES:
+                self._recent.pop(next(iter(self._recent)))
+            self._recent[key] = (time.time() + self.CACHE_TTL, response)
     
-    def summarize_document(self, params: Dict) -> str:
-        """Summarize a document or text using Groq AI"""
+    def _store(self, key: tuple, namespace: str, text: str, exact: tuple,
+               system: Optional[str], response: str):
+        """Write a fresh Groq response to every cache tier"""
+        self._remember(key, response)
+        if namespace in self.CACHE_THRESHOLDS:
+            self.cache.set((namespace,) + exact, text, response, self.CACHE_TTL)
+        if _DISK is not None:
+            _DISK.set(self._disk_key(key, system), response, expire=self.DISK_CACHE_TTL)
+    
+    def _query(self, key: tuple, namespace: str, text: str, prompt: str, exact: tuple,
+               system: Optional[str], context: Optional[str]) -> str:
+        """Cache lookups, falling back to Groq"""
+        cached = self._lookup(key, namespace, text, exact, system)
+        if cached is not None:
+            return cached
+        
+        if not getattr(self.groq_agent, 'client', None):
+            # process_query explains the missing configuration (not cached)
+            response, _ = self.groq_agent.process_query(prompt, language='en', system=system)
+            return response
+        
+        # Raises on failure, so errors never reach the caches
+        response = self.groq_agent.run_task(prompt, system, context=context)
+        self._store(key, namespace, text, exact, system, response)
+        return response
+    
+    def _ask_stream(self, namespace: str, text: str, prompt: str, exact: tuple = (),
+                    system: Optional[str] = None, header: str = '') -> Iterator[str]:
+        """Streaming variant of _ask: yields the header, then response chunks as they arrive"""
+        exact = tuple(str(value) for value in exact)
+        key = self._cache_key(namespace, text, exact)
+        flight_key, future, leader = self._join_flight(namespace, prompt, system, None)
+        
+        if not leader:
+            # The same request is already on its way: wait for the whole reply
+            try:
+                try:
+                    response = future.result()
+                except CancelledError:
+                    # Its reader stopped early, so nothing was cached
+                    response = self._ask(namespace, text, prompt, exact, system)
+            except _TASK_ERRORS as e:
+                logger.error(f"Error streaming {namespace}: {e}")
+                yield f"Error: {e}"
+                return
+            yield header
+            yield response
+            return
+        
+        parts: List[str] = []
         try:
-            text = params.get('text', '')
-            max_length = params.get('max_length', 200)
-            
-            if not text:
-                return "Error: No text provided for summarization"
-            
-            # Use Groq agent to summarize
-            if not self.groq_agent:
-                return "Groq agent not available for summarization"
+            response = self._lookup(key, namespace, text, exact, system)
+            if response is None and not getattr(self.groq_agent, 'client', None):
+                # process_query explains the missing configuration (not cached)
+                response, _ = self.groq_agent.process_query(prompt, language='en', system=system)
+            if response is not None:
+                future.set_result(response)
+                yield header
+                yield response
+                return
             
-            prompt = f"""Please provide a concise summary of the following text in approximately {max_length} words:
-
-{text[:4000]}  # Limit input size
-
-Summary:"""
+            for delta in self.groq_agent.run_task_stream(prompt, system):
+                if not parts:
+                    yield header
+                parts.append(delta)
+                yield delta
+            if not parts:
+                yield header
             
-            response, _ = self.groq_agent.process_query(prompt, language='en')
-            return f"Summary ({max_length} words):\n{response}"
+            response = ''.join(parts)
+            self._store(key, namespace, text, exact, system, response)
+            future.set_result(response)
+        except _TASK_ERRORS as e:
+            logger.error(f"Error streaming {namespace}: {e}")
+            future.set_exception(e)
+            yield f"\nError: {e}" if parts else f"Error: {e}"
+        finally:
+            # Still unresolved if the reader closed the stream early
+            future.cancel()
+            with self._in_flight_lock:
+                del self._in_flight[flight_key]
+    
+    def summarize_document(self, params: Dict, stream: bool = False) -> Union[str, Iterator[str]]:
+        """
+        Summarize a document or text using Groq AI
         
-        except Exception as e:
+        With stream=True the summary is returned as an iterator of text chunks
+        (validation errors are still returned as plain strings).
+        """
+        text, err = _validate(params, 'text', 'summarization')
+        max_length = params.get('max_length', 200)
+        
+        if err:
+            return err
+        
+        # Use Groq agent to summarize
+        if not self.groq_agent:
+            return "Groq agent not available for summarization"
+        
+        # Limit input size
+        prompt = _SUMMARIZE_TMPL.format_map({
+            'max_length': max_length,
+            'text': truncate_tokens(text, SUMMARIZE_MAX_TOKENS, SUMMARIZE_MAX_CHARS)
+        })
+        
+        header = f"Summary ({max_length} words):\n"
+        if stream:
+            return self._ask_stream('summarize', text, prompt, exact=(max_length,),
+                                    system=SUMMARIZE_SYSTEM, header=header)
+        
+        try:
+            response = self._ask('summarize', text, prompt, exact=(max_length,), system=SUMMARIZE_SYSTEM)
+            return f"{header}{response}"
+        
+        except _TASK_ERRORS as e:
             logger.error(f"Error summarizing document: {e}")
             return f"Error: {e}"
     
     def translate_text(self, params: Dict) -> str:
         """Translate text to another language using Groq AI"""
+        text, err = _validate(params, 'text', 'translation')
+        target_language = params.get('target_language', 'urdu')
+        source_language = params.get('source_language', 'english')
+        
+        if err:
+            return err
+        
+        if not self.groq_agent:
+            return "Groq agent not available for translation"
+        
+        prompt = _TRANSLATE_TMPL.format_map({
+            'source_language': source_language,
+            'target_language': target_language,
+            'text': text
+        })
+        
         try:
-            text = params.get('text', '')
-            target_language = params.get('target_language', 'urdu')
-            source_language = params.get('source_language', 'english')
-            
-            if not text:
-                return "Error: No text provided for translation"
-            
-            if not self.groq_agent:
-                return "Groq agent not available for translation"
-            
-            prompt = f"""Translate the following text from {source_language} to {target_language}:
-
-{text}
-
-Translation:"""
-            
-            response, _ = self.groq_agent.process_query(prompt, language='en')
+            response = self._ask('translate', text, prompt, exact=(source_language, target_language),
+                                 system=TRANSLATE_SYSTEM)
             return f"Translation ({source_language} → {target_language}):\n{response}"
         
-        except Exception as e:
+        except _TASK_ERRORS as e:
             logger.error(f"Error translating text: {e}")
             return f"Error: {e}"
     
     def analyze_sentiment(self, params: Dict) -> str:
         """Analyze sentiment of text using Groq AI"""
+        text, err = _validate(params, 'text', 'sentiment analysis')
+        
+        if err:
+            return err
+        
+        if not self.groq_agent:
+            return "Groq agent not available for sentiment analysis"
+        
+        # Short texts are answered locally, skipping the network round trip
+        if len(text) < LOCAL_SENTIMENT_MAX_CHARS:
+            local = self._local_sentiment(text)
+            if local is not None:
+                return f"Sentiment Analysis:\n{local}"
+        
+        prompt = _SENTIMENT_TMPL.format_map({'text': text})
+        
         try:
-            text = params.get('text', '')
-            
-            if not text:
-                return "Error: No text provided for sentiment analysis"
-            
-            if not self.groq_agent:
-                return "Groq agent not available for sentiment analysis"
-            
-            prompt = f"""Analyze the sentiment of the following text. Respond with:
-- Sentiment: positive, negative, or neutral
-- Confidence: high, medium, or low
-- Brief explanation
-
-Text: {text}
-
-Analysis:"""
-            
-            response, _ = self.groq_agent.process_query(prompt, language='en')
+            response = self._ask('sentiment', text, prompt, system=SENTIMENT_SYSTEM)
             return f"Sentiment Analysis:\n{response}"
         
-        except Exception as e:
+        except _TASK_ERRORS as e:
             logger.error(f"Error analyzing sentiment: {e}")
             return f"Error: {e}"
     
+    def warm_up(self):
+        """Load the local sentiment model now, so no user request waits for its download"""
+        self._sentiment_model = _get_local_sentiment()
+    
+    def _local_sentiment(self, text: str) -> Optional[str]:
+        """Classify text with the local model in the Groq reply's format, or None if not loaded"""
+        classifier = self._sentiment_model
+        if classifier is None:
+            return None
+        try:
+            result = classifier(text)[0]
+        except Exception as e:
+            logger.error(f"Error running local sentiment model: {e}")
+            return None
+        
+        score = result['score']
+        if score < LOCAL_SENTIMENT_NEUTRAL_BELOW:
+            sentiment, confidence = 'neutral', 'medium'
+        else:
+            sentiment = result['label'].lower()
+            confidence = next(band for floor, band in LOCAL_SENTIMENT_CONFIDENCE if score >= floor)
+        return (f"- Sentiment: {sentiment}\n- Confidence: {confidence}\n"
+                f"- Explanation: {_LOCAL_SENTIMENT_EXPLANATIONS[sentiment]}")
+    
     def generate_code(self, params: Dict) -> str:
         """Generate code based on description using Groq AI"""
+        description, err = _validate(params, 'description', 'code generation')
+        language = params.get('language', 'python')
+        
+        if err:
+            return err
+        
+        if not self.groq_agent:
+            return "Groq agent not available for code generation"
+        
+        prompt = _GENERATE_CODE_TMPL.format_map({'language': language, 'description': description})
+        
         try:
-            description = params.get('description', '')
-            language = params.get('language', 'python')
-            
-            if not description:
-                return "Error: No description provided for code generation"
-            
-            if not self.groq_agent:
-                return "Groq agent not available for code generation"
-            
-            prompt = f"""Generate {language} code for the following task:
-
-{description}
-
-Provide complete, working code with comments:"""
-            
-            response, _ = self.groq_agent.process_query(prompt, language='en')
+            response = self._ask('generate_code', description, prompt, exact=(language,),
+                                 system=GENERATE_CODE_SYSTEM)
             
             # Return code - can be saved to file using code_module
             return f"Generated {language} code:\n\n{response}"
         
-        except Exception as e:
+        except _TASK_ERRORS as e:
             logger.error(f"Error generating code: {e}")
             return f"Error: {e}"
     
     def debug_code(self, params: Dict) -> str:
         """Help debug code using Groq AI"""
+        code, err = _validate(params, 'code', 'debugging', strip=False)
+        error_message = params.get('error', '')
+        
+        if err:
+            return err
+        
+        if not self.groq_agent:
+            return "Groq agent not available for debugging"
+        
+        prompt = f"Error message: {error_message}" if error_message else "No specific error provided."
+        
         try:
-            code = params.get('code', '')
-            error_message = params.get('error', '')
-            
-            if not code:
-                return "Error: No code provided for debugging"
-            
-            if not self.groq_agent:
-                return "Groq agent not available for debugging"
-            
-            prompt = f"""Help debug the following code. {'Error message: ' + error_message if error_message else 'No specific error provided.'}
-
-Code:
-```python
-{code}
-```
-
-Please identify issues and suggest fixes:"""
-            
-            response, _ = self.groq_agent.process_query(prompt, language='en')
+            response = self._ask('debug', f"{error_message}\n{code}", prompt, system=DEBUG_SYSTEM,
+                                 context=_code_context(code))
             return f"Debugging Analysis:\n{response}"
         
-        except Exception as e:
+        except _TASK_ERRORS as e:
             logger.error(f"Error debugging code: {e}")
             return f"Error: {e}"
-
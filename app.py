@@ -3,12 +3,25 @@ AI Desktop Assistant - Main Flask Application
 Handles web interface, API endpoints, and orchestration
 """
 
-from flask import Flask, render_template, request, jsonify, session
+from flask import Flask, render_template, request, jsonify, session, Response, stream_with_context
 from flask_cors import CORS
 import os
+import json
+import asyncio
+import functools
 import logging
+import queue
+import time
 from datetime import datetime
 import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Fast JSON serialization for large responses
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Load environment variables from .env file
 try:
@@ -22,22 +35,6 @@ except ImportError:
 except Exception as e:
     pass  # Will log later after logging is configured
 
-from groq_agent import GroqAgent
-from voice_module import VoiceModule
-from automation_module import AutomationModule
-from memory_module import MemoryModule
-from scheduler_module import SchedulerModule
-from code_module import CodeModule
-from learning_module import LearningModule
-from system_module import SystemModule
-from file_advanced_module import AdvancedFileModule
-from productivity_module import ProductivityModule
-from ai_advanced_module import AdvancedAIModule
-from communication_module import CommunicationModule
-from web_scraping_module import WebScrapingModule
-from health_module import HealthModule
-from input_automation_module import InputAutomationModule
-
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -49,106 +46,290 @@ app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', 'ai-assistant-secret-key-2024')
 CORS(app)
 
-# Initialize modules
-groq_agent = None
-voice_module = None
-automation_module = None
-memory_module = None
-scheduler_module = None
-code_module = None
-learning_module = None
-system_module = None
-file_advanced_module = None
-productivity_module = None
-ai_advanced_module = None
-communication_module = None
-web_scraping_module = None
-health_module = None
-input_automation_module = None
+if not ORJSON_AVAILABLE:
+    logger.warning("orjson not installed. Using the standard JSON encoder.")
 
-def initialize_modules():
-    """Initialize all assistant modules"""
-    global groq_agent, voice_module, automation_module, memory_module, scheduler_module
-    global code_module, learning_module, system_module, file_advanced_module, productivity_module
-    global ai_advanced_module, communication_module, web_scraping_module, health_module
-    global input_automation_module
+def ojsonify(obj):
+    """jsonify using orjson when available (serializes datetimes natively)"""
+    if not ORJSON_AVAILABLE:
+        return jsonify(obj)
+    return app.response_class(orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS), mimetype='application/json')
+
+# Modules are built lazily: each getter constructs its module on first use
+# (including its import) and returns the same instance afterwards, so the
+# server can answer requests while the rest still load in the background.
+
+def _lazy(factory):
+    """Turn a module factory into a thread-safe, build-once getter"""
+    lock = threading.Lock()
+    build = functools.cache(factory)
     
-    try:
-        # Initialize memory first (needed by other modules)
-        memory_module = MemoryModule()
-        
-        # Initialize Groq agent
-        api_key = os.environ.get('GROQ_API_KEY')
-        if not api_key:
-            logger.warning("GROQ_API_KEY not found in environment variables")
-        groq_agent = GroqAgent(api_key, memory_module)
-        
-        # Initialize voice module
-        voice_module = VoiceModule()
-        
-        # Initialize automation module
-        automation_module = AutomationModule(memory_module)
-        
-        # Initialize new modules (before passing to AI module)
-        code_module = CodeModule(memory_module)
-        learning_module = LearningModule(memory_module)
-        system_module = SystemModule(memory_module)
-        file_advanced_module = AdvancedFileModule(memory_module)
-        productivity_module = ProductivityModule(memory_module)
-        communication_module = CommunicationModule(memory_module)
-        web_scraping_module = WebScrapingModule(memory_module)
-        health_module = HealthModule(memory_module)
-        input_automation_module = InputAutomationModule(memory_module)
-        
-        # Initialize AI module (needs groq_agent which is already initialized above)
-        ai_advanced_module = AdvancedAIModule(groq_agent, memory_module)
-        
-        # Pass new modules to groq_agent and automation_module
-        if groq_agent:
-            groq_agent.code_module = code_module
-            groq_agent.learning_module = learning_module
-            groq_agent.system_module = system_module
-            groq_agent.file_advanced_module = file_advanced_module
-            groq_agent.productivity_module = productivity_module
-            groq_agent.ai_advanced_module = ai_advanced_module
-            groq_agent.communication_module = communication_module
-            groq_agent.web_scraping_module = web_scraping_module
-            groq_agent.health_module = health_module
-            groq_agent.input_automation_module = input_automation_module
-        
-        if automation_module:
-            automation_module.code_module = code_module
-            automation_module.learning_module = learning_module
-            automation_module.system_module = system_module
-            automation_module.file_advanced_module = file_advanced_module
-            automation_module.productivity_module = productivity_module
-            automation_module.ai_advanced_module = ai_advanced_module
-            automation_module.communication_module = communication_module
-            automation_module.web_scraping_module = web_scraping_module
-            automation_module.health_module = health_module
-            automation_module.input_automation_module = input_automation_module
-        
-        # Initialize scheduler
-        scheduler_module = SchedulerModule(memory_module, voice_module, automation_module)
-        
+    @functools.wraps(factory)
+    def get():
+        with lock:
+            return build()
+    return get
+
+def _optional(name):
+    """Wrap a module factory so any failure (including a missing package) logs and yields None"""
+    def wrap(factory):
+        @functools.wraps(factory)
+        def build():
+            try:
+                module = factory()
+                logger.info(f"{name} initialized")
+                return module
+            except Exception as e:
+                logger.error(f"Error initializing {name}: {e}")
+                return None
+        return build
+    return wrap
+
+@_lazy
+@_optional('Memory module')
+def _get_memory_module():
+    from memory_module import MemoryModule
+    return MemoryModule()
+
+@_lazy
+@_optional('Groq agent')
+def _get_groq_agent():
+    from groq_agent import GroqAgent
+    api_key = os.environ.get('GROQ_API_KEY')
+    if not api_key:
+        logger.warning("GROQ_API_KEY not found in environment variables")
+    return GroqAgent(api_key, _get_memory_module())
+
+@_lazy
+@_optional('Voice module')
+def _get_voice_module():
+    from voice_module import VoiceModule
+    return VoiceModule()
+
+@_lazy
+@_optional('Code module')
+def _get_code_module():
+    from code_module import CodeModule
+    return CodeModule(_get_memory_module())
+
+@_lazy
+@_optional('Learning module')
+def _get_learning_module():
+    from learning_module import LearningModule
+    return LearningModule(_get_memory_module())
+
+@_lazy
+@_optional('System module')
+def _get_system_module():
+    from system_module import SystemModule
+    return SystemModule(_get_memory_module())
+
+@_lazy
+@_optional('Advanced file module')
+def _get_file_advanced_module():
+    from file_advanced_module import AdvancedFileModule
+    return AdvancedFileModule(_get_memory_module())
+
+@_lazy
+@_optional('Productivity module')
+def _get_productivity_module():
+    from productivity_module import ProductivityModule
+    return ProductivityModule(_get_memory_module())
+
+@_lazy
+@_optional('Advanced AI module')
+def _get_ai_advanced_module():
+    from ai_advanced_module import AdvancedAIModule
+    return AdvancedAIModule(_get_groq_agent(), _get_memory_module())
+
+@_lazy
+@_optional('Communication module')
+def _get_communication_module():
+    from communication_module import CommunicationModule
+    return CommunicationModule(_get_memory_module())
+
+@_lazy
+@_optional('Web scraping module')
+def _get_web_scraping_module():
+    from web_scraping_module import WebScrapingModule
+    return WebScrapingModule(_get_memory_module())
+
+@_lazy
+@_optional('Health module')
+def _get_health_module():
+    from health_module import HealthModule
+    return HealthModule(_get_memory_module())
+
+@_lazy
+@_optional('Input automation module')
+def _get_input_automation_module():
+    from input_automation_module import InputAutomationModule
+    return InputAutomationModule(_get_memory_module())
+
+@_lazy
+@_optional('Automation module')
+def _get_automation_module():
+    from automation_module import AutomationModule
+    automation_module = AutomationModule(_get_memory_module())
+    automation_module.register_module('code_module', _get_code_module())
+    automation_module.register_module('learning_module', _get_learning_module())
+    automation_module.register_module('system_module', _get_system_module())
+    automation_module.register_module('file_advanced_module', _get_file_advanced_module())
+    automation_module.register_module('productivity_module', _get_productivity_module())
+    automation_module.register_module('ai_advanced_module', _get_ai_advanced_module())
+    automation_module.register_module('communication_module', _get_communication_module())
+    automation_module.register_module('web_scraping_module', _get_web_scraping_module())
+    automation_module.register_module('health_module', _get_health_module())
+    automation_module.register_module('input_automation_module', _get_input_automation_module())
+    return automation_module
+
+@_lazy
+@_optional('Scheduler module')
+def _get_scheduler_module():
+    from scheduler_module import SchedulerModule
+    return SchedulerModule(_get_memory_module(), _get_voice_module(), _get_automation_module())
+
+@_optional('Local AI models')
+def _warm_ai_models():
+    ai_advanced_module = _get_ai_advanced_module()
+    if ai_advanced_module:
+        ai_advanced_module.warm_up()
+    return ai_advanced_module
+
+# Construction order: each phase only depends on modules from earlier phases
+_INIT_PHASES = [
+    [_get_memory_module],
+    [_get_groq_agent, _get_voice_module, _get_code_module, _get_learning_module,
+     _get_system_module, _get_file_advanced_module, _get_productivity_module,
+     _get_communication_module, _get_web_scraping_module, _get_health_module,
+     _get_input_automation_module],
+    [_get_ai_advanced_module],
+    [_get_automation_module],
+    # Model downloads can be slow, so nothing waits on them
+    [_get_scheduler_module, _warm_ai_models],
+]
+
+def initialize_modules():
+    """Initialize all assistant modules (the scheduler must run for reminders to fire)"""
+    ok = True
+    # Modules within a phase are independent and mostly I/O-bound, so build them in parallel
+    with ThreadPoolExecutor(max_workers=8, thread_name_prefix='module-init') as executor:
+        for phase in _INIT_PHASES:
+            for getter, future in [(getter, executor.submit(getter)) for getter in phase]:
+                # One failing module must not stop the later phases (automation, scheduler)
+                try:
+                    if future.result() is None:
+                        ok = False
+                except Exception as e:
+                    logger.error(f"Error initializing modules ({getter.__name__}): {e}")
+                    ok = False
+    if ok:
         logger.info("All modules initialized successfully")
-        return True
-    except Exception as e:
-        logger.error(f"Error initializing modules: {e}")
-        return False
+    return ok
 
-# Initialize on startup
-if not initialize_modules():
-    logger.error("Failed to initialize modules. Some features may not work.")
+# Warm up in the background so startup and the first request don't wait on it
+threading.Thread(target=initialize_modules, name='module-init', daemon=True).start()
 
 @app.route('/')
 def index():
     """Main dashboard page"""
     return render_template('index.html')
 
+# Chat history writes happen off the request path; a single consumer keeps them in order
+_LOG_Q = queue.Queue()
+
+def _log_worker():
+    """Write queued chat exchanges to memory"""
+    while True:
+        entries = _LOG_Q.get()
+        try:
+            memory_module = _get_memory_module()
+            if memory_module:
+                memory_module.add_chat_entries(entries)
+        except Exception as e:
+            logger.error(f"Error writing chat history: {e}")
+        finally:
+            _LOG_Q.task_done()
+
+threading.Thread(target=_log_worker, name='chat-log', daemon=True).start()
+
+def log_chat(user_message, response, language):
+    """Queue a user/assistant exchange for the chat history"""
+    _LOG_Q.put_nowait([
+        ('user', user_message, language),
+        ('assistant', response, language)
+    ])
+
+# Workers for blocking action handlers, shared by all requests so a burst of
+# chat actions can't exhaust threads (most actions wait on I/O, not the CPU)
+_ACTION_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix='action')
+
+async def run_actions(actions):
+    """Run chat actions, concurrently unless one of them drives the desktop UI"""
+    automation_module = _get_automation_module()
+    if automation_module is None:
+        return [RuntimeError("Automation module not available") for _ in actions]
+    loop = asyncio.get_running_loop()
+    
+    def submit(action):
+        return loop.run_in_executor(_ACTION_POOL, automation_module.execute_action, action)
+    
+    if any(action.get('type') in automation_module.ORDERED_ACTIONS for action in actions):
+        results = []
+        for action in actions:
+            try:
+                results.append(await submit(action))
+            except Exception as e:
+                results.append(e)
+        return results
+    
+    # gather keeps results in action order
+    return await asyncio.gather(*[submit(action) for action in actions], return_exceptions=True)
+
+def format_action_results(actions, results):
+    """Pair each action with its result (or raised exception) for the JSON response"""
+    action_results = []
+    for action, result in zip(actions, results):
+        failed = isinstance(result, Exception)
+        action_results.append({
+            'action': action.get('type'),
+            'result': str(result) if failed else result,
+            'success': not failed
+        })
+    return action_results
+
+def stream_chat(user_message, language):
+    """Yield server-sent events: text deltas as Groq generates them, then the final result"""
+    groq_agent = _get_groq_agent()
+    try:
+        result = {'response': '', 'actions': []}
+        for event in groq_agent.process_query_stream(user_message, language):
+            if 'delta' in event:
+                yield f"data: {json.dumps(event)}\n\n"
+            else:
+                result = event
+        
+        log_chat(user_message, result['response'], language)
+        
+        actions = result['actions']
+        action_results = format_action_results(actions, asyncio.run(run_actions(actions))) if actions else []
+        
+        final = {
+            'done': True,
+            'response': result['response'],
+            'actions': action_results,
+            'timestamp': datetime.now().isoformat()
+        }
+        yield f"data: {json.dumps(final)}\n\n"
+    
+    except Exception as e:
+        logger.error(f"Error in chat stream: {e}")
+        yield f"data: {json.dumps({'done': True, 'error': str(e)})}\n\n"
+
 @app.route('/api/chat', methods=['POST'])
-def chat():
+async def chat():
     """Handle chat messages (text or voice transcription)"""
+    groq_agent = _get_groq_agent()
     try:
         data = request.json
         user_message = data.get('message', '').strip()
@@ -157,32 +338,20 @@ def chat():
         if not user_message:
             return jsonify({'error': 'Empty message'}), 400
         
-        # Store user message in memory
-        memory_module.add_chat_entry('user', user_message, language)
+        # Stream tokens to the client as they are generated
+        if data.get('stream'):
+            return Response(stream_with_context(stream_chat(user_message, language)),
+                            mimetype='text/event-stream')
         
         # Get response from Groq agent
-        assistant_response, actions = groq_agent.process_query(user_message, language)
+        assistant_response, actions = await groq_agent.aprocess_query(user_message, language)
         
-        # Store assistant response
-        memory_module.add_chat_entry('assistant', assistant_response, language)
+        log_chat(user_message, assistant_response, language)
         
         # Execute any actions if needed
         action_results = []
         if actions:
-            for action in actions:
-                try:
-                    result = automation_module.execute_action(action)
-                    action_results.append({
-                        'action': action.get('type'),
-                        'result': result,
-                        'success': True
-                    })
-                except Exception as e:
-                    action_results.append({
-                        'action': action.get('type'),
-                        'result': str(e),
-                        'success': False
-                    })
+            action_results = format_action_results(actions, await run_actions(actions))
         
         return jsonify({
             'response': assistant_response,
@@ -197,6 +366,7 @@ def chat():
 @app.route('/api/voice/start', methods=['POST'])
 def start_voice_listening():
     """Start continuous voice listening"""
+    voice_module = _get_voice_module()
     try:
         if voice_module:
             voice_module.start_listening()
@@ -209,6 +379,7 @@ def start_voice_listening():
 @app.route('/api/voice/stop', methods=['POST'])
 def stop_voice_listening():
     """Stop voice listening"""
+    voice_module = _get_voice_module()
     try:
         if voice_module:
             voice_module.stop_listening()
@@ -221,6 +392,7 @@ def stop_voice_listening():
 @app.route('/api/voice/transcribe', methods=['POST'])
 def transcribe_audio():
     """Transcribe audio file from frontend"""
+    voice_module = _get_voice_module()
     try:
         if 'audio' not in request.files:
             return jsonify({'error': 'No audio file provided'}), 400
@@ -240,19 +412,10 @@ def transcribe_audio():
         logger.error(f"Error transcribing audio: {e}")
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/tasks', methods=['GET'])
-def get_tasks():
-    """Get all tasks"""
-    try:
-        tasks = memory_module.get_all_tasks()
-        return jsonify({'tasks': tasks})
-    except Exception as e:
-        logger.error(f"Error getting tasks: {e}")
-        return jsonify({'error': str(e)}), 500
-
 @app.route('/api/tasks', methods=['POST'])
 def add_task():
     """Add a new task"""
+    memory_module = _get_memory_module()
     try:
         data = request.json
         task_text = data.get('task', '')
@@ -267,6 +430,7 @@ def add_task():
 @app.route('/api/tasks/<int:task_id>', methods=['PUT'])
 def update_task(task_id):
     """Update task status"""
+    memory_module = _get_memory_module()
     try:
         data = request.json
         status = data.get('status', 'pending')
@@ -279,6 +443,7 @@ def update_task(task_id):
 @app.route('/api/tasks/<int:task_id>', methods=['DELETE'])
 def delete_task(task_id):
     """Delete a task"""
+    memory_module = _get_memory_module()
     try:
         memory_module.delete_task(task_id)
         return jsonify({'status': 'deleted'})
@@ -286,19 +451,11 @@ def delete_task(task_id):
         logger.error(f"Error deleting task: {e}")
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/reminders', methods=['GET'])
-def get_reminders():
-    """Get all reminders"""
-    try:
-        reminders = memory_module.get_all_reminders()
-        return jsonify({'reminders': reminders})
-    except Exception as e:
-        logger.error(f"Error getting reminders: {e}")
-        return jsonify({'error': str(e)}), 500
-
 @app.route('/api/reminders', methods=['POST'])
 def add_reminder():
     """Add a new reminder"""
+    memory_module = _get_memory_module()
+    scheduler_module = _get_scheduler_module()
     try:
         data = request.json
         reminder_text = data.get('reminder', '')
@@ -315,19 +472,13 @@ def add_reminder():
         logger.error(f"Error adding reminder: {e}")
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/logs', methods=['GET'])
-def get_logs():
-    """Get activity logs"""
-    try:
-        logs = memory_module.get_activity_logs()
-        return jsonify({'logs': logs})
-    except Exception as e:
-        logger.error(f"Error getting logs: {e}")
-        return jsonify({'error': str(e)}), 500
+# Text-to-speech workers: reused across requests and capped so bursts queue up
+_SPEAK_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix='tts')
 
 @app.route('/api/speak', methods=['POST'])
 def speak_text():
     """Convert text to speech with natural voice"""
+    voice_module = _get_voice_module()
     try:
         data = request.json
         text = data.get('text', '')
@@ -341,20 +492,16 @@ def speak_text():
             voice_module.stop_listening()
             logger.info("Stopped listening before speaking to prevent echo")
         
-        # Speak the text in a separate thread to not block the response
-        import threading
+        # Speak the text on the TTS pool to not block the response
         def speak_and_resume():
             try:
                 voice_module.speak(text, language)
                 # Wait a moment before resuming to ensure audio is done
-                import time
                 time.sleep(0.5)
             except Exception as e:
                 logger.error(f"Error in speak thread: {e}")
         
-        speak_thread = threading.Thread(target=speak_and_resume)
-        speak_thread.daemon = True
-        speak_thread.start()
+        _SPEAK_POOL.submit(speak_and_resume)
         
         return jsonify({'status': 'speaking'})
     except Exception as e:
@@ -364,6 +511,7 @@ def speak_text():
 @app.route('/api/memory/query', methods=['POST'])
 def query_memory():
     """Query chat history and memory"""
+    memory_module = _get_memory_module()
     try:
         data = request.json
         query = data.get('query', '')
@@ -374,89 +522,37 @@ def query_memory():
         logger.error(f"Error querying memory: {e}")
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/system/info', methods=['GET'])
-def get_system_info():
-    """Get system information"""
-    try:
-        if system_module:
-            info = system_module.get_system_info()
-            return jsonify({'info': info})
-        return jsonify({'error': 'System module not available'}), 503
-    except Exception as e:
-        logger.error(f"Error getting system info: {e}")
-        return jsonify({'error': str(e)}), 500
+# Read-only endpoints: path -> (module getter, method, response key, module label, argument builder)
+_GET_ROUTES = {
+    'tasks': (_get_memory_module, 'get_all_tasks', 'tasks', 'Memory', None),
+    'reminders': (_get_memory_module, 'get_all_reminders', 'reminders', 'Memory', None),
+    'logs': (_get_memory_module, 'get_activity_logs', 'logs', 'Memory', None),
+    'system/info': (_get_system_module, 'get_system_info', 'info', 'System', None),
+    'productivity/stats': (_get_productivity_module, 'get_productivity_stats', 'stats', 'Productivity', None),
+    'learning/flashcards': (_get_learning_module, 'get_flashcards', 'flashcards', 'Learning',
+                            lambda: (request.args.get('category', None),)),
+    'learning/stats': (_get_learning_module, 'get_study_stats', 'stats', 'Learning', None),
+    'health/stats': (_get_health_module, 'get_health_stats', 'stats', 'Health', None),
+    'input/mouse_position': (_get_input_automation_module, 'get_mouse_position', 'position', 'Input automation', None),
+    'input/screen_size': (_get_input_automation_module, 'get_screen_size', 'size', 'Input automation', None),
+}
 
-@app.route('/api/productivity/stats', methods=['GET'])
-def get_productivity_stats():
-    """Get productivity statistics"""
-    try:
-        if productivity_module:
-            stats = productivity_module.get_productivity_stats()
-            return jsonify({'stats': stats})
-        return jsonify({'error': 'Productivity module not available'}), 503
-    except Exception as e:
-        logger.error(f"Error getting productivity stats: {e}")
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/learning/flashcards', methods=['GET'])
-def get_flashcards():
-    """Get flashcards"""
-    try:
-        category = request.args.get('category', None)
-        if learning_module:
-            flashcards = learning_module.get_flashcards(category)
-            return jsonify({'flashcards': flashcards})
-        return jsonify({'error': 'Learning module not available'}), 503
-    except Exception as e:
-        logger.error(f"Error getting flashcards: {e}")
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/learning/stats', methods=['GET'])
-def get_learning_stats():
-    """Get learning statistics"""
-    try:
-        if learning_module:
-            stats = learning_module.get_study_stats()
-            return jsonify({'stats': stats})
-        return jsonify({'error': 'Learning module not available'}), 503
-    except Exception as e:
-        logger.error(f"Error getting learning stats: {e}")
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/health/stats', methods=['GET'])
-def get_health_stats():
-    """Get health statistics"""
-    try:
-        if health_module:
-            stats = health_module.get_health_stats()
-            return jsonify({'stats': stats})
-        return jsonify({'error': 'Health module not available'}), 503
-    except Exception as e:
-        logger.error(f"Error getting health stats: {e}")
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/input/mouse_position', methods=['GET'])
-def get_mouse_position():
-    """Get current mouse position"""
-    try:
-        if input_automation_module:
-            position = input_automation_module.get_mouse_position()
-            return jsonify({'position': position})
-        return jsonify({'error': 'Input automation module not available'}), 503
-    except Exception as e:
-        logger.error(f"Error getting mouse position: {e}")
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/input/screen_size', methods=['GET'])
-def get_screen_size():
-    """Get screen size"""
+@app.route('/api/<path:endpoint>', methods=['GET'])
+def get_endpoint(endpoint):
+    """Serve the read-only endpoints in _GET_ROUTES"""
+    route = _GET_ROUTES.get(endpoint)
+    if route is None:
+        return jsonify({'error': f'Unknown endpoint: {endpoint}'}), 404
+    
+    get_module, method, key, label, build_args = route
     try:
-        if input_automation_module:
-            size = input_automation_module.get_screen_size()
-            return jsonify({'size': size})
-        return jsonify({'error': 'Input automation module not available'}), 503
+        module = get_module()
+        if not module:
+            return jsonify({'error': f'{label} module not available'}), 503
+        args = build_args() if build_args else ()
+        return ojsonify({key: getattr(module, method)(*args)})
     except Exception as e:
-        logger.error(f"Error getting screen size: {e}")
+        logger.error(f"Error getting {endpoint}: {e}")
         return jsonify({'error': str(e)}), 500
 
 if __name__ == '__main__':
@@ -4,12 +4,21 @@ Handles VS Code integration, code generation, Git automation, and project templa
 """
 
 import os
+import re
 import subprocess
+import shutil
+import signal
+import sys
 import logging
+import threading
+import time
+from collections import OrderedDict, deque
 from pathlib import Path
 from typing import Dict, Optional, List
 import json
 
+from path_utils import norm_path
+
 logger = logging.getLogger(__name__)
 
 # Git automation
@@ -20,9 +29,87 @@ except ImportError:
     GIT_AVAILABLE = False
     logger.warning("GitPython not installed. Git automation will be limited.")
 
+# Project scaffolds: type -> {file name: content}; "{name}" is replaced by the project name
+PROJECT_TEMPLATES = {
+    'flask': {
+        'app.py': """from flask import Flask
+
+app = Flask(__name__)
+
+@app.route('/')
+def hello():
+    return '<h1>Hello, World!</h1>'
+
+if __name__ == '__main__':
+    app.run(debug=True)
+""",
+        'requirements.txt': "Flask==3.0.0\n",
+        '.gitignore': "venv/\n__pycache__/\n*.pyc\n.env\n",
+        'README.md': "# {name}\n\nFlask application\n",
+    },
+    'react': {
+        'package.json': json.dumps({
+            "name": "{name}",
+            "version": "1.0.0",
+            "scripts": {
+                "start": "react-scripts start"
+            },
+            "dependencies": {
+                "react": "^18.2.0",
+                "react-dom": "^18.2.0",
+                "react-scripts": "5.0.1"
+            }
+        }, indent=2),
+        'README.md': "# {name}\n\nReact application\n",
+    },
+    'python': {
+        'main.py': "# {name}\n\nif __name__ == '__main__':\n    print('Hello, World!')\n",
+        'README.md': "# {name}\n\nPython project\n",
+    },
+}
+
+# Seconds a git status result is reused for the same repository
+GIT_STATUS_TTL = 2
+
+# Potentially dangerous commands (Windows and POSIX), matched in one case-insensitive pass
+DANGEROUS_COMMANDS = ['format', 'del /f', 'rmdir /s', 'rm -rf', 'sudo', 'mkfs']
+_DANGEROUS_RE = re.compile('|'.join(map(re.escape, DANGEROUS_COMMANDS)), re.IGNORECASE)
+
+# run_terminal_command limits: wall-clock seconds, and output lines kept (the tail)
+COMMAND_TIMEOUT = 30
+COMMAND_OUTPUT_LINES = 2000
+
+def _launch(argv: List[str]) -> None:
+    """Start a program detached, without waiting on it or sharing our console"""
+    if sys.platform == 'win32':
+        subprocess.Popen(argv, close_fds=True,
+                         creationflags=subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP)
+    else:
+        # With an absolute path and close_fds/restore_signals off, subprocess uses
+        # posix_spawn rather than fork+exec, and Popen still reaps the child
+        subprocess.Popen(argv, close_fds=False, restore_signals=False)
+
+def _kill_tree(proc: subprocess.Popen) -> None:
+    """Kill a command started by run_terminal_command together with everything it spawned"""
+    try:
+        if sys.platform == 'win32':
+            subprocess.run(['taskkill', '/F', '/T', '/PID', str(proc.pid)], capture_output=True)
+        else:
+            # The command runs in its own session, so its process group id is its pid
+            os.killpg(proc.pid, signal.SIGKILL)
+    except (OSError, subprocess.SubprocessError):
+        pass
+    try:
+        proc.kill()
+    except OSError:
+        pass
+
 class CodeModule:
     """Handles code development operations"""
     
+    # Most Repo handles kept open by _get_repo
+    REPO_CACHE_MAX = 32
+    
     def __init__(self, memory_module=None):
         self.memory_module = memory_module
         self.home_dir = Path(os.path.expanduser('~'))
@@ -33,44 +120,66 @@ class CodeModule:
             r"C:\Program Files\Microsoft VS Code\Code.exe",
             r"C:\Program Files (x86)\Microsoft VS Code\Code.exe",
         ]
+        self._vscode_exe: Optional[str] = None
+        # repo path -> (monotonic time, status text); dropped whenever this module changes the repo
+        self._git_status_cache: Dict[str, tuple] = {}
+        # Open Repo handles by path, least recently used first
+        self._repo_cache: OrderedDict = OrderedDict()
     
-    def open_vscode(self, path: Optional[str] = None) -> str:
-        """Open VS Code, optionally with a specific file or folder"""
-        try:
-            # Find VS Code executable
-            vscode_exe = None
+    def _get_repo(self, repo_path: Path):
+        """Repo for repo_path, reusing an open handle when there is one"""
+        key = str(repo_path)
+        repo = self._repo_cache.get(key)
+        if repo is None:
+            repo = Repo(key)
+            self._repo_cache[key] = repo
+            if len(self._repo_cache) > self.REPO_CACHE_MAX:
+                self._repo_cache.popitem(last=False)[1].close()
+        else:
+            self._repo_cache.move_to_end(key)
+        return repo
+    
+    def _find_vscode(self) -> Optional[str]:
+        """VS Code executable path (looked up once, then cached), or None if not installed"""
+        if self._vscode_exe is None:
             for path_option in self.vscode_paths:
                 if os.path.exists(path_option):
-                    vscode_exe = path_option
+                    self._vscode_exe = path_option
                     break
-            
+            else:
+                # PATH lookup without spawning 'code --version'
+                self._vscode_exe = shutil.which('code')
+        return self._vscode_exe
+    
+    def open_vscode(self, path: Optional[str] = None) -> str:
+        """Open VS Code, optionally with a specific file or folder"""
+        try:
+            vscode_exe = self._find_vscode()
             if not vscode_exe:
-                # Try to find it via 'code' command
-                try:
-                    subprocess.run(['code', '--version'], check=True, capture_output=True)
-                    vscode_exe = 'code'
-                except:
-                    return "VS Code not found. Please install VS Code or add it to PATH."
+                return "VS Code not found. Please install VS Code or add it to PATH."
             
             # Open VS Code
             if path:
-                target_path = Path(path).expanduser().resolve()
-                if target_path.exists():
-                    subprocess.Popen([vscode_exe, str(target_path)])
-                    return f"Opened VS Code with {target_path}"
-                else:
-                    # Create file/folder if it doesn't exist
+                target_path = norm_path(path)
+                
+                # Create the file/folder unless it exists; the create call itself
+                # reports an existing path, so there's no separate exists() check
+                try:
                     if path.endswith('/') or not os.path.splitext(path)[1]:
                         # It's a folder
-                        target_path.mkdir(parents=True, exist_ok=True)
+                        target_path.mkdir(parents=True)
                     else:
                         # It's a file
                         target_path.parent.mkdir(parents=True, exist_ok=True)
-                        target_path.touch()
-                    subprocess.Popen([vscode_exe, str(target_path)])
-                    return f"Created and opened {target_path} in VS Code"
+                        target_path.touch(exist_ok=False)
+                except FileExistsError:
+                    _launch([vscode_exe, str(target_path)])
+                    return f"Opened VS Code with {target_path}"
+                
+                _launch([vscode_exe, str(target_path)])
+                return f"Created and opened {target_path} in VS Code"
             else:
-                subprocess.Popen([vscode_exe])
+                _launch([vscode_exe])
                 return "Opened VS Code"
         
         except Exception as e:
@@ -80,7 +189,7 @@ class CodeModule:
     def create_file(self, file_path: str, content: str = "", language: str = "text") -> str:
         """Create a new file with optional content"""
         try:
-            target_path = Path(file_path).expanduser().resolve()
+            target_path = norm_path(file_path)
             target_path.parent.mkdir(parents=True, exist_ok=True)
             
             with open(target_path, 'w', encoding='utf-8') as f:
@@ -115,7 +224,17 @@ class CodeModule:
             repo_path = params.get('path', os.getcwd())
             message = params.get('message', '')
             
-            repo_path = Path(repo_path).expanduser().resolve()
+            repo_path = norm_path(repo_path)
+            
+            # A fresh status for this repo can be answered without opening it
+            cache_key = str(repo_path)
+            if operation == 'status':
+                cached = self._git_status_cache.get(cache_key)
+                if cached and time.monotonic() - cached[0] < GIT_STATUS_TTL:
+                    return cached[1]
+            else:
+                # Every other operation changes the repository
+                self._git_status_cache.pop(cache_key, None)
             
             if operation == 'init':
                 if not repo_path.exists():
@@ -125,13 +244,14 @@ class CodeModule:
             
             # Check if it's a git repo
             try:
-                repo = Repo(str(repo_path))
+                repo = self._get_repo(repo_path)
             except:
                 return f"Not a Git repository: {repo_path}"
             
             if operation == 'status':
-                status = repo.git.status()
-                return f"Git Status:\n{status}"
+                result = f"Git Status:\n{repo.git.status()}"
+                self._git_status_cache[cache_key] = (time.monotonic(), result)
+                return result
             
             elif operation == 'commit':
                 if not message:
@@ -173,57 +293,31 @@ class CodeModule:
             project_name = params.get('name', 'my-project')
             target_dir = params.get('directory', self.home_dir / 'Desktop' / project_name)
             
-            target_dir = Path(target_dir).expanduser().resolve()
+            template = PROJECT_TEMPLATES.get(project_type.lower())
+            if template is None:
+                return f"Unknown project type: {project_type}. Supported: {', '.join(PROJECT_TEMPLATES)}"
+            
+            target_dir = norm_path(target_dir)
             target_dir.mkdir(parents=True, exist_ok=True)
             
+            # Write every file of the template in one pass
+            json_name = json.dumps(project_name)[1:-1]
+            for file_name, content in template.items():
+                name = json_name if file_name.endswith('.json') else project_name
+                with open(target_dir / file_name, 'w', encoding='utf-8', buffering=1 << 16) as f:
+                    f.write(content.replace('{name}', name))
+            
             if project_type.lower() == 'flask':
-                # Create Flask project structure
-                (target_dir / 'app.py').write_text("""from flask import Flask
-
-app = Flask(__name__)
-
-@app.route('/')
-def hello():
-    return '<h1>Hello, World!</h1>'
-
-if __name__ == '__main__':
-    app.run(debug=True)
-""")
-                (target_dir / 'requirements.txt').write_text("Flask==3.0.0\n")
-                (target_dir / '.gitignore').write_text("venv/\n__pycache__/\n*.pyc\n.env\n")
-                (target_dir / 'README.md').write_text(f"# {project_name}\n\nFlask application\n")
-                
                 # Initialize Git
                 if GIT_AVAILABLE:
                     Repo.init(str(target_dir))
-                
                 return f"Created Flask project '{project_name}' at {target_dir}"
             
             elif project_type.lower() == 'react':
-                # Create basic React structure (requires npm/node)
-                (target_dir / 'package.json').write_text(json.dumps({
-                    "name": project_name,
-                    "version": "1.0.0",
-                    "scripts": {
-                        "start": "react-scripts start"
-                    },
-                    "dependencies": {
-                        "react": "^18.2.0",
-                        "react-dom": "^18.2.0",
-                        "react-scripts": "5.0.1"
-                    }
-                }, indent=2))
-                (target_dir / 'README.md').write_text(f"# {project_name}\n\nReact application\n")
                 return f"Created React project '{project_name}' at {target_dir}. Run 'npm install' to install dependencies."
             
-            elif project_type.lower() == 'python':
-                # Simple Python project
-                (target_dir / 'main.py').write_text(f"# {project_name}\n\nif __name__ == '__main__':\n    print('Hello, World!')\n")
-                (target_dir / 'README.md').write_text(f"# {project_name}\n\nPython project\n")
-                return f"Created Python project '{project_name}' at {target_dir}"
-            
             else:
-                return f"Unknown project type: {project_type}. Supported: flask, react, python"
+                return f"Created Python project '{project_name}' at {target_dir}"
         
         except Exception as e:
             logger.error(f"Error creating project template: {e}")
@@ -238,37 +332,62 @@ if __name__ == '__main__':
             if not command:
                 return "Error: No command provided"
             
-            # List of potentially dangerous commands (Windows)
-            dangerous_commands = ['format', 'del /f', 'rmdir /s', 'rm -rf', 'sudo', 'mkfs']
-            
-            if confirm and any(cmd in command.lower() for cmd in dangerous_commands):
+            if confirm and _DANGEROUS_RE.search(command):
                 return f"⚠️ WARNING: Potentially dangerous command detected. For safety, this command requires manual confirmation: {command}"
             
-            # Run command
-            result = subprocess.run(
+            # Run command in its own process group, so a timeout can kill the shell and its children
+            if sys.platform == 'win32':
+                group = {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+            else:
+                group = {'start_new_session': True}
+            proc = subprocess.Popen(
                 command,
                 shell=True,
-                capture_output=True,
-                text=True,
-                timeout=30,
-                cwd=params.get('working_dir', os.getcwd())
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                bufsize=1 << 16,
+                close_fds=True,
+                cwd=params.get('working_dir', os.getcwd()),
+                **group
             )
             
-            output = result.stdout + result.stderr
+            # Stream output into a bounded tail on a reader thread, so waiting on it can time out
+            tail = deque(maxlen=COMMAND_OUTPUT_LINES)
+            reader = threading.Thread(target=tail.extend, args=(proc.stdout,), daemon=True)
+            reader.start()
+            deadline = time.monotonic() + COMMAND_TIMEOUT
+            try:
+                returncode = proc.wait(timeout=COMMAND_TIMEOUT)
+                # A background child can keep the pipe open after the shell exits
+                reader.join(max(0.0, deadline - time.monotonic()))
+                timed_out = reader.is_alive()
+            except subprocess.TimeoutExpired:
+                timed_out = True
+            
+            if timed_out:
+                _kill_tree(proc)
+                proc.wait()
+                # The pipe closes once the whole group is dead; don't wait on anything that escaped it
+                reader.join(1)
+                if not reader.is_alive():
+                    proc.stdout.close()
+                return f"Command timed out after {COMMAND_TIMEOUT} seconds"
+            proc.stdout.close()
+            
+            # Decode once, at the end
+            output = b''.join(tail).decode('utf-8', errors='replace')
             
             if self.memory_module:
                 self.memory_module.log_activity('command_executed', {
                     'command': command,
-                    'success': result.returncode == 0
+                    'success': returncode == 0
                 })
             
-            if result.returncode == 0:
+            if returncode == 0:
                 return f"Command executed successfully:\n{output}"
             else:
-                return f"Command failed (exit code {result.returncode}):\n{output}"
+                return f"Command failed (exit code {returncode}):\n{output}"
         
-        except subprocess.TimeoutExpired:
-            return "Command timed out after 30 seconds"
         except Exception as e:
             logger.error(f"Error running command: {e}")
             return f"Error running command: {e}"
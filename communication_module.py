@@ -5,6 +5,7 @@ Handles Telegram, LinkedIn, contact management, and social media
 
 import os
 import logging
+import threading
 from pathlib import Path
 from typing import Dict, Optional, List
 import sqlite3
@@ -12,19 +13,28 @@ from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Column order of the get_linkedin_drafts query
+_DRAFT_KEYS = ('id', 'title', 'content', 'scheduled_time', 'posted', 'created_at')
+
 class CommunicationModule:
     """Handles advanced communication features"""
     
     def __init__(self, memory_module=None):
         self.memory_module = memory_module
         self.db_path = Path(__file__).parent / 'communication.db'
+        # One autocommit connection shared by all threads, serialized by the lock
+        self.conn = None
+        self._lock = threading.Lock()
+        self._fts_available = False
         self._init_database()
     
     def _init_database(self):
         """Initialize communication database"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            cursor = self.conn.cursor()
             
             # Contacts table
             cursor.execute("""
@@ -52,12 +62,56 @@ class CommunicationModule:
                 )
             """)
             
-            conn.commit()
-            conn.close()
+            # Name lookups go through contacts_fts; an earlier name index only cost writes
+            cursor.execute("DROP INDEX IF EXISTS idx_contacts_name")
+            
+            self._init_contacts_fts(cursor)
+            
             logger.info("Communication database initialized")
         except Exception as e:
             logger.error(f"Error initializing communication database: {e}")
     
+    def _init_contacts_fts(self, cursor):
+        """Set up the trigram full-text index used for contact name search (needs SQLite 3.34+)"""
+        try:
+            exists = cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'contacts_fts'"
+            ).fetchone()
+            
+            cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS contacts_fts USING fts5(
+                    name, notes, content='contacts', content_rowid='id', tokenize='trigram'
+                )
+            """)
+            
+            # Keep the index in sync with the contacts table
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS contacts_ai AFTER INSERT ON contacts BEGIN
+                    INSERT INTO contacts_fts(rowid, name, notes) VALUES (new.id, new.name, new.notes);
+                END
+            """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS contacts_ad AFTER DELETE ON contacts BEGIN
+                    INSERT INTO contacts_fts(contacts_fts, rowid, name, notes)
+                    VALUES ('delete', old.id, old.name, old.notes);
+                END
+            """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS contacts_au AFTER UPDATE ON contacts BEGIN
+                    INSERT INTO contacts_fts(contacts_fts, rowid, name, notes)
+                    VALUES ('delete', old.id, old.name, old.notes);
+                    INSERT INTO contacts_fts(rowid, name, notes) VALUES (new.id, new.name, new.notes);
+                END
+            """)
+            
+            # Index contacts saved before the table existed
+            if not exists:
+                cursor.execute("INSERT INTO contacts_fts(contacts_fts) VALUES ('rebuild')")
+            
+            self._fts_available = True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Contact full-text search unavailable, using LIKE: {e}")
+    
     def add_contact(self, params: Dict) -> str:
         """Add a contact to the database"""
         try:
@@ -71,14 +125,11 @@ class CommunicationModule:
             if not name:
                 return "Error: Contact name required"
             
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO contacts (name, email, phone, whatsapp, telegram, notes, created_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (name, email, phone, whatsapp, telegram, notes, datetime.now().isoformat()))
-            conn.commit()
-            conn.close()
+            with self._lock:
+                self.conn.execute("""
+                    INSERT INTO contacts (name, email, phone, whatsapp, telegram, notes, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, (name, email, phone, whatsapp, telegram, notes, datetime.now().isoformat()))
             
             return f"Added contact: {name}"
         
@@ -86,6 +137,35 @@ class CommunicationModule:
             logger.error(f"Error adding contact: {e}")
             return f"Error: {e}"
     
+    def add_contacts_bulk(self, rows: List[Dict]) -> int:
+        """Add many contacts in one transaction; returns how many were added"""
+        try:
+            now = datetime.now().isoformat()
+            params = [
+                (r['name'], r.get('email', ''), r.get('phone', ''), r.get('whatsapp', ''),
+                 r.get('telegram', ''), r.get('notes', ''), now)
+                for r in rows if r.get('name')
+            ]
+            
+            # The connection autocommits, so open the transaction explicitly: one commit for all rows
+            with self._lock:
+                self.conn.execute("BEGIN")
+                try:
+                    self.conn.executemany("""
+                        INSERT INTO contacts (name, email, phone, whatsapp, telegram, notes, created_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """, params)
+                    self.conn.execute("COMMIT")
+                except Exception:
+                    self.conn.execute("ROLLBACK")
+                    raise
+            
+            return len(params)
+        
+        except Exception as e:
+            logger.error(f"Error adding contacts: {e}")
+            return 0
+    
     def get_contact(self, params: Dict) -> str:
         """Get contact information"""
         try:
@@ -94,16 +174,23 @@ class CommunicationModule:
             if not name:
                 return "Error: Contact name required"
             
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT name, email, phone, whatsapp, telegram, notes
-                FROM contacts
-                WHERE name LIKE ?
-            """, (f'%{name}%',))
-            
-            contact = cursor.fetchone()
-            conn.close()
+            with self._lock:
+                # Trigrams need at least 3 characters; shorter names scan with LIKE
+                if self._fts_available and len(name) >= 3:
+                    query = 'name:"{}"'.format(name.replace('"', '""'))
+                    contact = self.conn.execute("""
+                        SELECT c.name, c.email, c.phone, c.whatsapp, c.telegram, c.notes
+                        FROM contacts c JOIN contacts_fts f ON f.rowid = c.id
+                        WHERE contacts_fts MATCH ?
+                        ORDER BY c.id
+                        LIMIT 1
+                    """, (query,)).fetchone()
+                else:
+                    contact = self.conn.execute("""
+                        SELECT name, email, phone, whatsapp, telegram, notes
+                        FROM contacts
+                        WHERE name LIKE ?
+                    """, (f'%{name}%',)).fetchone()
             
             if contact:
                 return f"Contact: {contact[0]}\nEmail: {contact[1] or 'N/A'}\nPhone: {contact[2] or 'N/A'}\nWhatsApp: {contact[3] or 'N/A'}\nTelegram: {contact[4] or 'N/A'}\nNotes: {contact[5] or 'N/A'}"
@@ -124,14 +211,11 @@ class CommunicationModule:
             if not content:
                 return "Error: Post content required"
             
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO linkedin_drafts (title, content, scheduled_time, created_at)
-                VALUES (?, ?, ?, ?)
-            """, (title, content, scheduled_time, datetime.now().isoformat()))
-            conn.commit()
-            conn.close()
+            with self._lock:
+                self.conn.execute("""
+                    INSERT INTO linkedin_drafts (title, content, scheduled_time, created_at)
+                    VALUES (?, ?, ?, ?)
+                """, (title, content, scheduled_time, datetime.now().isoformat()))
             
             return f"Saved LinkedIn draft: {title or 'Untitled'}"
         
@@ -142,28 +226,15 @@ class CommunicationModule:
     def get_linkedin_drafts(self) -> List[Dict]:
         """Get all LinkedIn drafts"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT id, title, content, scheduled_time, posted, created_at
-                FROM linkedin_drafts
-                WHERE posted = 0
-                ORDER BY created_at DESC
-            """)
+            with self._lock:
+                rows = self.conn.execute("""
+                    SELECT id, title, content, scheduled_time, posted, created_at
+                    FROM linkedin_drafts
+                    WHERE posted = 0
+                    ORDER BY created_at DESC
+                """).fetchall()
             
-            drafts = []
-            for row in cursor.fetchall():
-                drafts.append({
-                    'id': row[0],
-                    'title': row[1],
-                    'content': row[2],
-                    'scheduled_time': row[3],
-                    'posted': row[4],
-                    'created_at': row[5]
-                })
-            
-            conn.close()
-            return drafts
+            return [dict(zip(_DRAFT_KEYS, row)) for row in rows]
         
         except Exception as e:
             logger.error(f"Error getting LinkedIn drafts: {e}")
@@ -4,13 +4,20 @@ Handles content-based search, duplicate finding, batch operations, image/PDF pro
 """
 
 import os
+import re
 import hashlib
+import uuid
+import mmap
 import logging
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Optional
 import shutil
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+from path_utils import norm_path
+
 logger = logging.getLogger(__name__)
 
 # Image processing
@@ -23,11 +30,97 @@ except ImportError:
 
 # PDF processing
 try:
-    import PyPDF2
+    from pypdf import PdfReader, PdfWriter
     PDF_AVAILABLE = True
 except ImportError:
-    PDF_AVAILABLE = False
-    logger.warning("PyPDF2 not installed. PDF operations will be limited.")
+    try:
+        from PyPDF2 import PdfReader, PdfWriter  # older name of pypdf
+        PDF_AVAILABLE = True
+    except ImportError:
+        PDF_AVAILABLE = False
+        logger.warning("pypdf not installed. PDF operations will be limited.")
+
+# Shared workers for file hashing and renames (the syscalls and hashing release the GIL)
+_FS_POOL = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4), thread_name_prefix='fs')
+
+def _blake2b():
+    """BLAKE2b hasher with a 16-byte digest"""
+    return hashlib.blake2b(digest_size=16)
+
+def _walk(dirpath: str, exts: tuple):
+    """Yield paths of files under dirpath whose (lowercased) name ends with one of exts"""
+    try:
+        with os.scandir(dirpath) as it:
+            for entry in it:
+                # DirEntry answers is_dir/is_file from the directory listing, no stat()
+                if entry.is_dir(follow_symlinks=False):
+                    yield from _walk(entry.path, exts)
+                elif entry.is_file() and entry.name.lower().endswith(exts):
+                    yield entry.path
+    except OSError:
+        return
+
+def _rename(pair: tuple) -> None:
+    """Rename src to dst"""
+    os.rename(*pair)
+
+def _rename_batch(pairs: list) -> tuple:
+    """Run independent (src, dst) renames in parallel; return (done pairs, [(pair, error)] failures)"""
+    futures = [(pair, _FS_POOL.submit(_rename, pair)) for pair in pairs]
+    done, failed = [], []
+    for pair, future in futures:
+        try:
+            future.result()
+            done.append(pair)
+        except OSError as e:
+            failed.append((pair, e))
+    return done, failed
+
+# Content search skips files bigger than this unless asked
+SEARCH_MAX_FILE_MB = 100
+
+def _file_contains(path: str, pattern: re.Pattern, max_size: int) -> bool:
+    """Whether the file's bytes match pattern, scanning a read-only memory map"""
+    try:
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0 or size > max_size:
+                return False
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return pattern.search(mm) is not None
+    except (OSError, ValueError):
+        return False
+
+# Bytes hashed by the same-size prefilter; files this small are fully hashed by it
+_HEAD_BYTES = 1 << 16
+
+def _digest_head(path: Path) -> Optional[bytes]:
+    """BLAKE2b digest of a file's first _HEAD_BYTES, or None if it can't be read"""
+    try:
+        with open(path, 'rb') as f:
+            h = _blake2b()
+            h.update(f.read(_HEAD_BYTES))
+            return h.digest()
+    except OSError:
+        return None
+
+def _digest(path: Path) -> Optional[bytes]:
+    """BLAKE2b digest of a file's contents, or None if it can't be read"""
+    try:
+        with open(path, 'rb') as f:
+            if hasattr(hashlib, 'file_digest'):
+                # Python 3.11+: the whole read+hash loop runs in C without the GIL
+                return hashlib.file_digest(f, _blake2b).digest()
+            
+            h = _blake2b()
+            if os.fstat(f.fileno()).st_size < 1 << 16:
+                h.update(f.read())
+            else:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    h.update(mm)
+            return h.digest()
+    except (OSError, ValueError):
+        return None
 
 class AdvancedFileModule:
     """Handles advanced file operations"""
@@ -40,26 +133,25 @@ class AdvancedFileModule:
         """Search for text content in files"""
         try:
             search_text = params.get('text', '').lower()
+            max_size = int(params.get('max_size_mb', SEARCH_MAX_FILE_MB) * (1 << 20))
             directory = params.get('directory', str(self.home_dir))
             file_extensions = params.get('extensions', ['.txt', '.md', '.py', '.js', '.html', '.css'])
             
             if not search_text:
                 return "Error: Search text required"
             
-            directory = Path(directory).expanduser().resolve()
+            directory = norm_path(directory)
             if not directory.exists():
                 return f"Directory not found: {directory}"
             
-            matches = []
-            for ext in file_extensions:
-                for file_path in directory.rglob(f'*{ext}'):
-                    try:
-                        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                            content = f.read().lower()
-                            if search_text in content:
-                                matches.append(str(file_path))
-                    except:
-                        continue
+            # One walk for all extensions; the regex scans the mapped bytes in C,
+            # with no decode or lowercased copy of each file. It runs inline: page
+            # faults on the map happen inside re.search, which holds the GIL, so
+            # worker threads would not overlap them
+            exts = tuple(ext.lower() for ext in file_extensions)
+            pattern = re.compile(re.escape(search_text.encode('utf-8')), re.IGNORECASE)
+            matches = [path for path in _walk(str(directory), exts)
+                       if _file_contains(path, pattern, max_size)]
             
             if matches:
                 result = f"Found {len(matches)} files containing '{search_text}':\n"
@@ -78,33 +170,48 @@ class AdvancedFileModule:
         """Find duplicate files by content hash"""
         try:
             directory = params.get('directory', str(self.home_dir / 'Downloads'))
-            directory = Path(directory).expanduser().resolve()
+            directory = norm_path(directory)
             
             if not directory.exists():
                 return f"Directory not found: {directory}"
             
+            # Only files sharing a size can be duplicates, so stat everything first
+            size_map = defaultdict(list)
+            for file_path in directory.rglob('*'):
+                try:
+                    if file_path.is_file():
+                        size_map[file_path.stat().st_size].append(file_path)
+                except OSError:
+                    continue
+            candidates = [(size, path) for size, paths in size_map.items() if len(paths) > 1 for path in paths]
+            
+            # Same size: compare the first 64 KiB, which usually differ (headers etc.)
+            head_groups = defaultdict(list)
+            heads = _FS_POOL.map(_digest_head, [path for _, path in candidates])
+            for (size, file_path), head in zip(candidates, heads):
+                if head is not None:
+                    head_groups[size, head].append(file_path)
+            finalists = [(key, path) for key, paths in head_groups.items() if len(paths) > 1 for path in paths]
+            
+            # Same head: hash the whole file, unless the head already covered all of it.
+            # Hashing runs in parallel to overlap disk IO
+            needs_full = [path for (size, _), path in finalists if size > _HEAD_BYTES]
+            full_hashes = dict(zip(needs_full, _FS_POOL.map(_digest, needs_full)))
+            
             file_hashes = {}
             duplicates = []
             
-            for file_path in directory.rglob('*'):
-                if file_path.is_file():
-                    try:
-                        # Calculate MD5 hash
-                        hash_md5 = hashlib.md5()
-                        with open(file_path, "rb") as f:
-                            for chunk in iter(lambda: f.read(4096), b""):
-                                hash_md5.update(chunk)
-                        file_hash = hash_md5.hexdigest()
-                        
-                        if file_hash in file_hashes:
-                            duplicates.append({
-                                'original': str(file_hashes[file_hash]),
-                                'duplicate': str(file_path)
-                            })
-                        else:
-                            file_hashes[file_hash] = file_path
-                    except:
-                        continue
+            for key, file_path in finalists:
+                file_hash = full_hashes[file_path] if key[0] > _HEAD_BYTES else key
+                if file_hash is None:
+                    continue
+                if file_hash in file_hashes:
+                    duplicates.append({
+                        'original': str(file_hashes[file_hash]),
+                        'duplicate': str(file_path)
+                    })
+                else:
+                    file_hashes[file_hash] = file_path
             
             if duplicates:
                 result = f"Found {len(duplicates)} duplicate files:\n"
@@ -125,13 +232,17 @@ class AdvancedFileModule:
             pattern = params.get('pattern', 'file_{}.{}')  # {n} for number, {e} for extension
             prefix = params.get('prefix', 'renamed_')
             
-            directory = Path(directory).expanduser().resolve()
+            directory = norm_path(directory)
             if not directory.exists():
                 return f"Directory not found: {directory}"
             
-            files = [f for f in directory.iterdir() if f.is_file()]
-            renamed_count = 0
+            # DirEntry.is_file() comes from the directory listing: no stat() per entry
+            with os.scandir(directory) as it:
+                entries = list(it)
+            files = [Path(e.path) for e in entries if e.is_file(follow_symlinks=False)]
             
+            # Plan every rename before touching the filesystem
+            plan = []
             for idx, file_path in enumerate(files, 1):
                 ext = file_path.suffix
                 new_name = pattern.format(idx, ext.lstrip('.'))
@@ -142,10 +253,50 @@ class AdvancedFileModule:
                 
                 new_path = directory / new_name
                 if new_path != file_path:
-                    file_path.rename(new_path)
-                    renamed_count += 1
+                    plan.append((str(file_path), str(new_path)))
+            
+            # Targets must be unique and must not hit any entry that stays put (files
+            # left as they are, subdirectories, symlinks)
+            targets = {dst for _, dst in plan}
+            kept = {e.path for e in entries} - {src for src, _ in plan}
+            if len(targets) != len(plan):
+                return "Error: Pattern would give several files the same name"
+            clashes = targets & kept
+            if clashes:
+                return f"Error: {min(clashes)} already exists"
+            
+            # A target may be another file's current name, so move everything to a
+            # temporary name first; each phase's renames are independent and run in parallel
+            tag = uuid.uuid4().hex[:8]
+            staged = [(src, os.path.join(directory, f".rename-{tag}-{i}")) for i, (src, _) in enumerate(plan)]
+            origin = {tmp: src for src, tmp in staged}
+            stranded = []  # (current path, original path) of files that could not be put back
+            
+            moved, failed = _rename_batch(staged)
+            if not failed:
+                renamed, failed = _rename_batch([(tmp, dst) for (_, tmp), (_, dst) in zip(staged, plan)])
+                if not failed:
+                    return f"Renamed {len(plan)} files"
+                
+                # Roll back: final names to temporary ones, so the original names are free again
+                _, lost = _rename_batch([(dst, tmp) for tmp, dst in renamed])
+                stranded += [(dst, origin[tmp]) for (dst, tmp), _ in lost]
+                lost_tmps = {tmp for (_, tmp), _ in lost}
+                moved = [(src, tmp) for src, tmp in moved if tmp not in lost_tmps]
             
-            return f"Renamed {renamed_count} files"
+            # ...then temporary names back to the originals
+            _, lost = _rename_batch([(tmp, src) for src, tmp in moved])
+            stranded += [(tmp, src) for (tmp, src), _ in lost]
+            
+            (path, _), error = failed[0]
+            message = f"Error: Could not rename {origin.get(path, path)}: {error}"
+            if stranded:
+                message += "\nThese files could not be restored to their original names:"
+                message += "".join(f"\n{current} (was {original})" for current, original in stranded)
+            else:
+                message += "\nNo files were renamed"
+            logger.error(message)
+            return message
         
         except Exception as e:
             logger.error(f"Error batch renaming: {e}")
@@ -160,15 +311,24 @@ class AdvancedFileModule:
             image_path = params.get('path', '')
             quality = params.get('quality', 85)  # 0-100
             
-            image_path = Path(image_path).expanduser().resolve()
+            image_path = norm_path(image_path)
             if not image_path.exists():
                 return f"Image not found: {image_path}"
             
-            img = Image.open(image_path)
-            
-            # Save compressed version
             output_path = image_path.parent / f"{image_path.stem}_compressed{image_path.suffix}"
-            img.save(output_path, optimize=True, quality=quality)
+            
+            # Read through a large buffer; the image is decoded lazily during save
+            with open(image_path, 'rb', buffering=1 << 20) as f:
+                img = Image.open(f)
+                
+                if img.format == 'JPEG':
+                    if params.get('half'):
+                        # libjpeg downscales while decoding (DCT scaling), skipping most of the work
+                        img.draft('RGB', (img.size[0] // 2, img.size[1] // 2))
+                    # Save compressed version
+                    img.save(output_path, optimize=True, quality=quality, progressive=True)
+                else:
+                    img.save(output_path, optimize=True, quality=quality)
             
             # Compare sizes
             original_size = image_path.stat().st_size
@@ -184,7 +344,7 @@ class AdvancedFileModule:
     def merge_pdfs(self, params: Dict) -> str:
         """Merge multiple PDF files"""
         if not PDF_AVAILABLE:
-            return "PDF processing not available. Install PyPDF2: pip install PyPDF2"
+            return "PDF processing not available. Install pypdf: pip install pypdf"
         
         try:
             pdf_files = params.get('files', [])
@@ -193,18 +353,21 @@ class AdvancedFileModule:
             if not pdf_files or len(pdf_files) < 2:
                 return "Error: At least 2 PDF files required"
             
-            output_path = Path(output_path).expanduser().resolve()
-            merger = PyPDF2.PdfMerger()
+            output_path = norm_path(output_path)
             
-            for pdf_file in pdf_files:
-                pdf_path = Path(pdf_file).expanduser().resolve()
-                if pdf_path.exists():
-                    merger.append(str(pdf_path))
-                else:
+            # Check every input before writing anything, so a typo can't leave a partial merge
+            pdf_paths = [norm_path(pdf_file) for pdf_file in pdf_files]
+            for pdf_path in pdf_paths:
+                if not pdf_path.exists():
                     return f"PDF not found: {pdf_path}"
             
-            merger.write(str(output_path))
-            merger.close()
+            # Copy pages straight from each reader instead of PdfMerger's full re-parse
+            writer = PdfWriter()
+            for pdf_path in pdf_paths:
+                writer.append_pages_from_reader(PdfReader(str(pdf_path), strict=False))
+            
+            with open(output_path, 'wb', buffering=1 << 20) as f:
+                writer.write(f)
             
             return f"Merged {len(pdf_files)} PDFs into: {output_path}"
         
@@ -4,56 +4,114 @@ Groq Agent Module - Handles LLM reasoning and response generation
 
 import os
 import json
+import re
 import logging
-from typing import Dict, List, Optional
+import asyncio
+import threading
+import concurrent.futures
+from typing import Dict, Iterator, List, Optional
 from datetime import datetime
 
 try:
-    from groq import Groq
+    from groq import Groq, APIError, RateLimitError
+    import httpx
+    # Failures of a Groq call that callers should handle (timeouts, 4xx/5xx, connection)
+    GROQ_ERRORS: tuple = (APIError, httpx.HTTPError)
 except ImportError:
     Groq = None
+    RateLimitError = None
+    GROQ_ERRORS = ()
     logging.warning("groq package not installed. Install with: pip install groq")
 
 logger = logging.getLogger(__name__)
 
-class GroqAgent:
-    """Handles communication with Groq API for AI reasoning"""
-    
-    def __init__(self, api_key: Optional[str] = None, memory_module=None):
-        self.api_key = api_key or os.environ.get('GROQ_API_KEY')
-        self.memory_module = memory_module
-        self.client = None
-        
-        if self.api_key and Groq:
-            try:
-                self.client = Groq(api_key=self.api_key)
-                logger.info("Groq client initialized successfully")
-            except Exception as e:
-                logger.error(f"Failed to initialize Groq client: {e}")
-        else:
-            logger.warning("Groq API key not provided or package not installed")
-    
-    def get_system_prompt(self) -> str:
-        """Generate system prompt for the assistant"""
-        # Get user context from memory
-        user_context = ""
-        if self.memory_module:
+# Backoff for rate-limited (429) calls
+try:
+    from tenacity import retry, retry_if_exception_type, wait_exponential_jitter, stop_after_attempt
+    TENACITY_AVAILABLE = True
+except ImportError:
+    TENACITY_AVAILABLE = False
+    logger.warning("tenacity not installed. Rate-limited Groq calls will not be retried.")
+
+# Fast JSON parsing of model replies (orjson errors subclass json.JSONDecodeError)
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+
+def retry_rate_limits(func):
+    """Retry a Groq call on RateLimitError with jittered exponential backoff"""
+    if not TENACITY_AVAILABLE or RateLimitError is None:
+        return func
+    return retry(
+        retry=retry_if_exception_type(RateLimitError),
+        wait=wait_exponential_jitter(1, 30),
+        stop=stop_after_attempt(5),
+        reraise=True
+    )(func)
+
+
+# One connection pool for every Groq call in the process (httpx.Client is thread-safe),
+# so warm keep-alive connections skip the TCP/TLS handshake on each request
+_HTTP_CLIENT = None
+# Seconds an idle pooled connection is kept; httpx's 5s default drops it between
+# the spoken queries of a normal conversation
+KEEPALIVE_EXPIRY = 60
+_HTTP_CLIENT_LOCK = threading.Lock()
+
+
+def get_http_client():
+    """Return the shared HTTP/2 client for the Groq SDK, creating it on first use"""
+    global _HTTP_CLIENT
+    with _HTTP_CLIENT_LOCK:
+        if _HTTP_CLIENT is None:
+            limits = httpx.Limits(max_connections=100, max_keepalive_connections=50,
+                                  keepalive_expiry=KEEPALIVE_EXPIRY)
             try:
-                # Try to get user profile from database
-                import sqlite3
-                conn = sqlite3.connect(self.memory_module.db_path)
-                cursor = conn.cursor()
-                cursor.execute("SELECT details FROM activity_logs WHERE action_type = 'user_profile' ORDER BY timestamp DESC LIMIT 1")
-                result = cursor.fetchone()
-                if result:
-                    user_context = f"\n\n**User Context:**\n{result[0]}\n"
-                conn.close()
-            except:
-                pass
-        
-        return f"""You are JARVIS, an AI Desktop Assistant helping Anas Raheem (AI student & developer). You have access to his full profile and preferences.
-{user_context}
-**Your Capabilities:**
+                _HTTP_CLIENT = httpx.Client(http2=True, timeout=60, limits=limits)
+            except ImportError:
+                # HTTP/2 needs the optional 'h2' package
+                _HTTP_CLIENT = httpx.Client(timeout=60, limits=limits)
+        return _HTTP_CLIENT
+
+
+# Using llama-3.3-70b-versatile (replacement for deprecated llama-3.1-70b-versatile)
+# Alternative models: "llama-3.1-8b-instant" (faster), "mixtral-8x7b-32768" (fast)
+_MODEL = "llama-3.3-70b-versatile"
+# response_format for action requests; shared, never mutated
+_JSON_FORMAT = {"type": "json_object"}
+
+# Words that mark a message as an action request (matched as substrings, like `in`)
+ACTION_KEYWORDS = [
+    'open', 'run', 'launch', 'search', 'browse', 'send', 'email',
+    'delete', 'move', 'copy', 'organize', 'clean', 'remind',
+    'handle', 'perform', 'execute', 'do', 'make', 'create',
+    'folder', 'file', 'task', 'reminder', 'schedule'
+]
+_ACTION_KEYWORDS_RE = re.compile('|'.join(map(re.escape, ACTION_KEYWORDS)), re.IGNORECASE)
+
+# Keywords the fallback action extractor looks for, found in one scan. Some of them
+# ('start', 'google', 'chrome', 'mail to') are not ACTION_KEYWORDS, so the fallback
+# also runs for plain-text requests. Longer phrases are covered by a shorter keyword
+# ('send email' by 'email', 'reminder' by 'remind').
+# Matches are substrings, not whole words, so 'downloads' still counts as 'download';
+# _extract_actions tests the found set against the frozensets below
+_INTENT_RE = re.compile(
+    'open|launch|run|start|google|browser|chrome|search|e?mail to|email|clean|download|remind',
+    re.IGNORECASE
+)
+_OPEN_WORDS = frozenset({'open', 'launch', 'run', 'start'})
+_EMAIL_WORDS = frozenset({'email', 'mail to', 'email to'})
+
+# Search query after the search verb, up to "on google"/"in ..." or the end
+_QUERY_RE = re.compile(r'(?:search(?:\s+for)?|find|look\s+up)\s+(?:for\s+)?(.+?)(?:\s+on\s+google|\s+in\b|$)', re.IGNORECASE)
+_QUERY_STOPWORDS = frozenset({'on', 'in', 'google', 'the', 'for'})
+
+# Assistant system prompt: the intro, then the user profile (if any), then this fixed block
+_PROMPT_INTRO = """You are JARVIS, an AI Desktop Assistant helping Anas Raheem (AI student & developer). You have access to his full profile and preferences."""
+
+_PROMPT_CAPABILITIES = """**Your Capabilities:**
 
 1. File & Folder Operations:
    - CREATE folders (desktop, documents, downloads, custom paths)
@@ -144,19 +202,19 @@ class GroqAgent:
 
 When user requests an action, respond in JSON:
 ```json
-{{
+{
   "response": "Your natural, friendly response",
   "actions": [
-    {{
+    {
       "type": "organize_files",
-      "parameters": {{
+      "parameters": {
         "action": "create_folder",
         "folder_name": "FolderName",
         "location": "desktop"
-      }}
-    }}
+      }
+    }
   ]
-}}
+}
 ```
 
 **Available Action Types:**
@@ -189,116 +247,355 @@ When user requests an action, respond in JSON:
 - **ALWAYS respond in ENGLISH by default** (only use Urdu if explicitly requested)
 - For sensitive operations (delete, format, etc.), ask confirmation first"""
 
-    def process_query(self, user_message: str, language: str = 'en') -> tuple:
+# Appended to the system prompt when several numbered requests share one call
+_BATCH_INSTRUCTIONS = """
+
+**Batched Requests:**
+The user message holds several numbered requests ("1) ...", "2) ...").
+Answer each independently and respond with one JSON object:
+{"replies": [{"index": 1, "response": "...", "actions": [...]}, ...]}
+with exactly one reply per numbered request, in order."""
+
+class GroqAgent:
+    """Handles communication with Groq API for AI reasoning"""
+    
+    def __init__(self, api_key: Optional[str] = None, memory_module=None):
+        self.api_key = api_key or os.environ.get('GROQ_API_KEY')
+        self.memory_module = memory_module
+        self.client = None
+        # Assembled system prompt and the user-profile timestamp it was built from
+        self._prompt_cache = None
+        self._prompt_profile_ts = None
+        # Runs the chat-history read alongside the system-prompt build
+        self._prep_executor = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix='groq-prep')
+        
+        if self.api_key and Groq:
+            try:
+                self.client = Groq(api_key=self.api_key, http_client=get_http_client())
+                logger.info("Groq client initialized successfully")
+            except Exception as e:
+                logger.error(f"Failed to initialize Groq client: {e}")
+        else:
+            logger.warning("Groq API key not provided or package not installed")
+    
+    @retry_rate_limits
+    def _create_completion(self, **kwargs):
+        """Send a chat completion on the shared client"""
+        return self.client.chat.completions.create(**kwargs)
+    
+    def get_system_prompt(self) -> str:
+        """Generate system prompt for the assistant (rebuilt only when the user profile changes)"""
+        profile_ts, user_context = None, ""
+        if self.memory_module:
+            try:
+                # Latest user profile, on the memory module's reused connection
+                self.memory_module.flush_logs()
+                result = self.memory_module.get_connection().execute(
+                    "SELECT timestamp, details FROM activity_logs WHERE action_type = 'user_profile' ORDER BY timestamp DESC LIMIT 1"
+                ).fetchone()
+                if result:
+                    profile_ts = result[0]
+                    user_context = f"\n\n**User Context:**\n{result[1]}\n"
+            except:
+                pass
+        
+        if self._prompt_cache is None or profile_ts != self._prompt_profile_ts:
+            self._prompt_cache = f"{_PROMPT_INTRO}\n{user_context}\n{_PROMPT_CAPABILITIES}"
+            self._prompt_profile_ts = profile_ts
+        return self._prompt_cache
+
+
+    def process_query(self, user_message: str, language: str = 'en', system: Optional[str] = None) -> tuple:
         """
         Process user query and return response with actions
         
+        Args:
+            user_message: The user's message
+            language: 'en' or 'ur'
+            system: Optional fixed system prompt for a standalone task (summarize,
+                translate...). Replaces the assistant prompt and skips chat history,
+                so identical instructions form a stable, cacheable prefix.
+        
         Returns:
             tuple: (response_text, actions_list)
         """
+        # Same request as process_query_stream; the last event carries the full reply
+        for event in self.process_query_stream(user_message, language, system):
+            pass
+        return event['response'], event['actions']
+    
+    def process_query_stream(self, user_message: str, language: str = 'en', system: Optional[str] = None):
+        """
+        Stream a query response as it is generated
+        
+        Yields:
+            dict: {'delta': text} for each chunk of plain-text output, then a final
+                {'response': response_text, 'actions': actions_list}. JSON (action)
+                replies are requested unstreamed, so they only produce the final event.
+        """
         if not self.client:
-            return "I'm sorry, the Groq API is not configured. Please set GROQ_API_KEY environment variable.", []
+            yield {'response': "I'm sorry, the Groq API is not configured. Please set GROQ_API_KEY environment variable.", 'actions': []}
+            return
         
         try:
-            # Get chat history for context
-            chat_history = []
-            if self.memory_module:
-                recent_chats = self.memory_module.get_recent_chats(limit=10)
-                for chat in recent_chats:
-                    role = chat.get('role', 'user')
-                    content = chat.get('content', '')
-                    chat_history.append({
-                        'role': role,
-                        'content': content
-                    })
-            
-            # Build messages
-            messages = [
-                {'role': 'system', 'content': self.get_system_prompt()}
-            ]
-            
-            # Add recent chat history (last 10 messages for context)
-            messages.extend(chat_history[-10:])
-            
-            # Add language instruction
-            language_instruction = ""
-            if language == 'ur':
-                language_instruction = " [RESPOND IN URDU]"
+            if system is not None:
+                messages = [
+                    {'role': 'system', 'content': system},
+                    {'role': 'user', 'content': user_message}
+                ]
+                use_json = False
             else:
-                language_instruction = " [RESPOND IN ENGLISH]"
+                messages = self._build_messages(user_message, language)
+                use_json = self._should_use_json(user_message)
             
-            # Add current user message with language instruction
-            messages.append({
-                'role': 'user',
-                'content': user_message + language_instruction
+            if use_json:
+                # A JSON reply is only usable once complete, so there is nothing to stream
+                response = self._create_completion(
+                    model=_MODEL,
+                    messages=messages,
+                    temperature=0.7,
+                    max_tokens=1024,
+                    response_format=_JSON_FORMAT
+                )
+                assistant_message = response.choices[0].message.content
+            else:
+                stream = self._create_completion(
+                    model=_MODEL,
+                    messages=messages,
+                    temperature=0.7,
+                    max_tokens=1024,
+                    stream=True
+                )
+                
+                parts = []
+                for chunk in stream:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        parts.append(delta)
+                        yield {'delta': delta}
+                assistant_message = ''.join(parts)
+            if system is not None:
+                response_text, actions = assistant_message, []
+            else:
+                response_text, actions = self._finish_query(assistant_message, user_message, use_json)
+        
+        except Exception as e:
+            logger.error(f"Error streaming query with Groq: {e}")
+            response_text, actions = f"I encountered an error: {str(e)}", []
+        
+        yield {'response': response_text, 'actions': actions}
+    
+    def _build_messages(self, user_message: str, language: str) -> List[Dict]:
+        """Build the message list: system prompt, recent history, then the user message"""
+        # Fetch chat history on the prep executor while the system prompt is built here;
+        # both hit SQLite, each on its own thread-local connection
+        history_future = None
+        if self.memory_module:
+            history_future = self._prep_executor.submit(self.memory_module.get_recent_chats, limit=10)
+        system_prompt = self.get_system_prompt()
+        
+        # Get chat history for context
+        chat_history = []
+        if history_future:
+            recent_chats = history_future.result()
+            for chat in recent_chats:
+                role = chat.get('role', 'user')
+                content = chat.get('content', '')
+                chat_history.append({
+                    'role': role,
+                    'content': content
+                })
+        
+        # Build messages
+        messages = [
+            {'role': 'system', 'content': system_prompt}
+        ]
+        
+        # Add recent chat history (last 10 messages for context)
+        messages.extend(chat_history[-10:])
+        
+        # Add language instruction
+        language_instruction = ""
+        if language == 'ur':
+            language_instruction = " [RESPOND IN URDU]"
+        else:
+            language_instruction = " [RESPOND IN ENGLISH]"
+        
+        # Add current user message with language instruction
+        messages.append({
+            'role': 'user',
+            'content': user_message + language_instruction
+        })
+        return messages
+    
+    def _finish_query(self, assistant_message: str, user_message: str, used_json: bool = False) -> tuple:
+        """Extract response text and actions from a reply and log the interaction"""
+        # Parse the reply once, then extract actions and text from it
+        if used_json:
+            # json_object mode: the reply is a JSON object, no need to sniff for one
+            try:
+                parsed = _json_loads(assistant_message)
+            except json.JSONDecodeError:
+                parsed = None
+            if not isinstance(parsed, dict):
+                parsed = None
+            actions = self._extract_actions(parsed, user_message)
+        else:
+            # The system prompt still asks for JSON on actions, so sniff for it
+            parsed = self._parse_reply(assistant_message)
+            actions = self._extract_actions(parsed, user_message)
+        response_text = self._extract_response_text(parsed, assistant_message)
+        self._log_query(user_message, response_text, actions)
+        return response_text, actions
+    
+    def _log_query(self, user_message: str, response_text: str, actions: List[Dict]):
+        """Log one answered query to the activity log"""
+        if self.memory_module:
+            self.memory_module.log_activity('groq_query', {
+                'user_message': user_message,
+                'response': response_text,
+                'actions': actions
             })
-            
-            # Get response from Groq
-            # Using llama-3.3-70b-versatile (replacement for deprecated llama-3.1-70b-versatile)
-            # Alternative models: "llama-3.1-8b-instant" (faster), "mixtral-8x7b-32768" (fast)
-            response = self.client.chat.completions.create(
-                model="llama-3.3-70b-versatile",  # Current supported model
+    
+    def process_queries_batched(self, user_messages: List[str], language: str = 'en') -> List[tuple]:
+        """
+        Answer several independent queries with a single Groq call
+        
+        The messages are sent as one numbered list and the model returns one
+        reply object per entry. If the batched reply cannot be mapped back to
+        the inputs, each message is sent through process_query instead.
+        
+        Returns:
+            list: (response_text, actions_list) per message, in input order
+        """
+        if len(user_messages) < 2 or not self.client:
+            return [self.process_query(message, language) for message in user_messages]
+        
+        numbered = "\n".join(f"{i}) {message}" for i, message in enumerate(user_messages, 1))
+        messages = self._build_messages(numbered, language)
+        messages[0] = {'role': 'system', 'content': messages[0]['content'] + _BATCH_INSTRUCTIONS}
+        
+        try:
+            response = self._create_completion(
+                model=_MODEL,
                 messages=messages,
                 temperature=0.7,
-                max_tokens=1024,
-                response_format={"type": "json_object"} if self._should_use_json(user_message) else None
+                max_tokens=min(1024 * len(user_messages), 8192),
+                response_format=_JSON_FORMAT
             )
-            
-            assistant_message = response.choices[0].message.content
-            
-            # Parse response and extract actions
-            actions = self._extract_actions(assistant_message, user_message)
-            response_text = self._extract_response_text(assistant_message)
-            
-            # Log the interaction
-            if self.memory_module:
-                self.memory_module.log_activity('groq_query', {
-                    'user_message': user_message,
-                    'response': response_text,
-                    'actions': actions
-                })
-            
-            return response_text, actions
+            replies = self._map_batched_replies(response.choices[0].message.content, len(user_messages))
+            if replies is not None:
+                results = []
+                for user_message, reply in zip(user_messages, replies):
+                    actions = self._extract_actions(reply, user_message)
+                    response_text = self._extract_response_text(reply, '')
+                    self._log_query(user_message, response_text, actions)
+                    results.append((response_text, actions))
+                return results
+            logger.warning("Batched Groq reply did not match the requests; answering them one by one")
         
         except Exception as e:
-            logger.error(f"Error processing query with Groq: {e}")
-            return f"I encountered an error: {str(e)}", []
+            logger.error(f"Error processing batched queries with Groq: {e}")
+        
+        return [self.process_query(message, language) for message in user_messages]
+    
+    def _map_batched_replies(self, assistant_message: str, count: int) -> Optional[List[Dict]]:
+        """The per-request reply objects of a batched reply in input order, or None if they don't line up"""
+        parsed = self._parse_reply(assistant_message)
+        replies = parsed.get('replies') if parsed is not None else None
+        if not isinstance(replies, list) or len(replies) != count:
+            return None
+        if not all(isinstance(reply, dict) for reply in replies):
+            return None
+        
+        # Place replies by their index when every one carries a distinct valid one
+        indexes = [reply.get('index') for reply in replies]
+        if sorted(i for i in indexes if isinstance(i, int)) == list(range(1, count + 1)):
+            ordered = [None] * count
+            for index, reply in zip(indexes, replies):
+                ordered[index - 1] = reply
+            return ordered
+        return replies
+    
+    def run_task(self, user_message: str, system: str, context: Optional[str] = None) -> str:
+        """
+        Run a single-turn completion with a caller-supplied system prompt
+        
+        Unlike process_query this raises on failure (GROQ_ERRORS), so callers
+        can tell errors apart from replies. Rate limits are retried first.
+        `context` (e.g. a code file) is sent as its own message before
+        user_message, so it stays part of a reusable prompt prefix.
+        """
+        response = self._create_completion(
+            model=_MODEL,
+            messages=self._task_messages(user_message, system, context),
+            temperature=0.7,
+            max_tokens=1024
+        )
+        return response.choices[0].message.content
+    
+    def run_task_stream(self, user_message: str, system: str, context: Optional[str] = None) -> Iterator[str]:
+        """Streaming variant of run_task: yields reply chunks as they arrive, raises like run_task"""
+        stream = self._create_completion(
+            model=_MODEL,
+            messages=self._task_messages(user_message, system, context),
+            temperature=0.7,
+            max_tokens=1024,
+            stream=True
+        )
+        for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                yield delta
+    
+    def _task_messages(self, user_message: str, system: str, context: Optional[str]) -> List[Dict]:
+        """Messages for run_task(_stream): system, optional context, then the user message"""
+        messages = [{'role': 'system', 'content': system}]
+        if context:
+            messages.append({'role': 'user', 'content': context})
+        messages.append({'role': 'user', 'content': user_message})
+        return messages
+    
+    async def aprocess_query(self, user_message: str, language: str = 'en') -> tuple:
+        """Async variant of process_query for use with asyncio.gather"""
+        # Runs the blocking client on a worker thread: Flask gives every async
+        # view its own event loop, so a shared AsyncGroq pool would outlive it
+        return await asyncio.to_thread(self.process_query, user_message, language)
     
     def _should_use_json(self, user_message: str) -> bool:
         """Determine if the response should be in JSON format (for action requests)"""
-        action_keywords = [
-            'open', 'run', 'launch', 'search', 'browse', 'send', 'email',
-            'delete', 'move', 'copy', 'organize', 'clean', 'remind',
-            'handle', 'perform', 'execute', 'do', 'make', 'create',
-            'folder', 'file', 'task', 'reminder', 'schedule'
-        ]
-        return any(keyword in user_message.lower() for keyword in action_keywords)
+        return _ACTION_KEYWORDS_RE.search(user_message) is not None
+    
+    def _parse_reply(self, assistant_message: str) -> Optional[Dict]:
+        """The assistant reply as a JSON object, or None if it is plain text"""
+        if assistant_message.strip().startswith('{'):
+            try:
+                return _json_loads(assistant_message)
+            except json.JSONDecodeError:
+                pass
+        return None
     
-    def _extract_actions(self, assistant_message: str, user_message: str) -> List[Dict]:
-        """Extract action commands from assistant response"""
+    def _extract_actions(self, parsed: Optional[Dict], user_message: str) -> List[Dict]:
+        """Extract action commands from the parsed assistant response (see _parse_reply)"""
         actions = []
         
-        try:
-            # Try to parse as JSON first
-            if assistant_message.strip().startswith('{'):
-                data = json.loads(assistant_message)
-                if 'actions' in data:
-                    actions.extend(data['actions'])
-                return actions
-        except json.JSONDecodeError:
-            pass
+        # A JSON reply lists its actions explicitly
+        if parsed is not None:
+            if 'actions' in parsed:
+                actions.extend(parsed['actions'])
+            return actions
         
-        # Extract actions from natural language using keyword matching
-        message_lower = user_message.lower()
+        # Extract actions from natural language using keyword matching (one regex pass)
+        found = {match.lower() for match in _INTENT_RE.findall(user_message)}
         
         # Open application
-        if any(x in message_lower for x in ['open', 'launch', 'run', 'start']):
-            if 'google' in message_lower or 'browser' in message_lower or 'chrome' in message_lower:
+        if found & _OPEN_WORDS:
+            if found & {'google', 'browser', 'chrome'}:
                 actions.append({
                     'type': 'browse_url',
                     'parameters': {'url': 'https://www.google.com'}
                 })
-            elif 'search' in message_lower and 'google' in message_lower:
+            elif 'search' in found and 'google' in found:
                 # Extract search query
                 search_query = self._extract_search_query(user_message)
                 if search_query:
@@ -308,7 +605,7 @@ When user requests an action, respond in JSON:
                     })
         
         # Search Google
-        if 'search' in message_lower and 'google' in message_lower:
+        if 'search' in found and 'google' in found:
             search_query = self._extract_search_query(user_message)
             if search_query:
                 actions.append({
@@ -317,7 +614,7 @@ When user requests an action, respond in JSON:
                 })
         
         # Send email
-        if any(x in message_lower for x in ['send email', 'email', 'mail to']):
+        if found & _EMAIL_WORDS:
             email_info = self._extract_email_info(user_message)
             if email_info:
                 actions.append({
@@ -326,14 +623,14 @@ When user requests an action, respond in JSON:
                 })
         
         # File operations
-        if 'clean' in message_lower and ('download' in message_lower or 'downloads' in message_lower):
+        if 'clean' in found and 'download' in found:
             actions.append({
                 'type': 'organize_files',
                 'parameters': {'directory': 'downloads', 'action': 'clean'}
             })
         
         # Reminder
-        if 'remind' in message_lower or 'reminder' in message_lower:
+        if 'remind' in found:
             reminder_info = self._extract_reminder_info(user_message)
             if reminder_info:
                 actions.append({
@@ -343,33 +640,21 @@ When user requests an action, respond in JSON:
         
         return actions
     
-    def _extract_response_text(self, assistant_message: str) -> str:
-        """Extract readable response text from assistant message"""
-        try:
-            if assistant_message.strip().startswith('{'):
-                data = json.loads(assistant_message)
-                return data.get('response', assistant_message)
-        except json.JSONDecodeError:
-            pass
+    def _extract_response_text(self, parsed: Optional[Dict], assistant_message: str) -> str:
+        """Extract readable response text from the parsed assistant response"""
+        if parsed is not None:
+            return parsed.get('response', assistant_message)
         return assistant_message
     
     def _extract_search_query(self, message: str) -> Optional[str]:
         """Extract search query from user message"""
-        keywords = ['search', 'for', 'find', 'look up']
-        message_lower = message.lower()
+        match = _QUERY_RE.search(message)
+        if not match:
+            return None
         
-        for keyword in keywords:
-            if keyword in message_lower:
-                idx = message_lower.find(keyword)
-                # Try to extract text after keyword
-                parts = message[idx:].split()
-                if len(parts) > 1:
-                    # Remove common words and join
-                    query_parts = [p for p in parts[1:] if p not in ['on', 'in', 'google', 'the', 'for']]
-                    return ' '.join(query_parts)
-        
-        # If no keyword found, return message after "search" or similar
-        return None
+        # Remove common words and join
+        query = ' '.join(p for p in match.group(1).split() if p not in _QUERY_STOPWORDS)
+        return query or None
     
     def _extract_email_info(self, message: str) -> Optional[Dict]:
         """Extract email information from user message"""
@@ -4,26 +4,43 @@ Handles break reminders, eye strain alerts, water intake tracking, and exercise
 """
 
 import logging
-from typing import Dict, Optional
+import math
+import threading
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 import sqlite3
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+def _water_amount(value) -> float:
+    """A water amount in ml as a number (int when whole); ValueError if it isn't one"""
+    amount = float(value)
+    if not math.isfinite(amount):
+        raise ValueError(value)
+    return int(amount) if amount.is_integer() else amount
+
 class HealthModule:
     """Handles health and wellness tracking"""
     
     def __init__(self, memory_module=None):
         self.memory_module = memory_module
         self.db_path = Path(__file__).parent / 'health.db'
+        # One autocommit connection shared by all threads, serialized by the lock
+        self.conn = None
+        self._lock = threading.Lock()
+        # date -> total ml of water, loaded on first use and kept current by log_water_intake
+        self._daily_totals: Optional[Dict[str, float]] = None
         self._init_database()
     
     def _init_database(self):
         """Initialize health database"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute("PRAGMA temp_store=MEMORY")
+            cursor = self.conn.cursor()
             
             # Water intake
             cursor.execute("""
@@ -46,8 +63,10 @@ class HealthModule:
                 )
             """)
             
-            conn.commit()
-            conn.close()
+            # Covering indexes: the per-day water sums and the weekly exercise sum read only these
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_water_date ON water_intake(date, amount_ml)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_exercise_date ON exercise(date, duration_minutes)")
+            
             logger.info("Health database initialized")
         except Exception as e:
             logger.error(f"Error initializing health database: {e}")
@@ -55,20 +74,16 @@ class HealthModule:
     def log_water_intake(self, params: Dict) -> str:
         """Log water intake"""
         try:
-            amount = params.get('amount', 250)  # ml
+            try:
+                amount = _water_amount(params.get('amount', 250))  # ml
+            except (TypeError, ValueError):
+                return f"Error: Water amount must be a number of ml, not {params.get('amount')!r}"
             date = params.get('date', datetime.now().date().isoformat())
             
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO water_intake (amount_ml, date, created_at)
-                VALUES (?, ?, ?)
-            """, (amount, date, datetime.now().isoformat()))
-            conn.commit()
-            conn.close()
-            
-            # Calculate daily total
-            daily_total = self._get_daily_water(date)
+            with self._lock:
+                self._insert_water([(amount, date, datetime.now().isoformat())])
+                # Running daily total, no second query
+                daily_total = self._daily_totals[date]
             target = 2000  # ml per day
             
             return f"Logged {amount}ml water intake. Daily total: {daily_total}ml / {target}ml"
@@ -77,17 +92,55 @@ class HealthModule:
             logger.error(f"Error logging water intake: {e}")
             return f"Error: {e}"
     
+    def log_water_bulk(self, entries: List[Dict]) -> int:
+        """Log many water intake entries in one transaction; returns how many were logged"""
+        try:
+            now = datetime.now().isoformat()
+            today = datetime.now().date().isoformat()
+            rows = [(_water_amount(e.get('amount', 250)), e.get('date', today), now) for e in entries]
+            
+            with self._lock:
+                self._insert_water(rows)
+            return len(rows)
+        
+        except Exception as e:
+            logger.error(f"Error logging water intake: {e}")
+            return 0
+    
+    def _insert_water(self, rows: List[Tuple[float, str, str]]):
+        """Insert (amount_ml, date, created_at) rows and add them to the daily totals (call with _lock held)"""
+        totals = self._load_daily_totals()
+        self._insert_many("""
+            INSERT INTO water_intake (amount_ml, date, created_at)
+            VALUES (?, ?, ?)
+        """, rows)
+        for amount, date, _ in rows:
+            totals[date] = totals.get(date, 0) + amount
+    
+    def _insert_many(self, sql: str, rows: List[Tuple]):
+        """executemany in one explicit transaction (call with _lock held)"""
+        # The connection autocommits, so open the transaction explicitly: one commit for all rows
+        self.conn.execute("BEGIN")
+        try:
+            self.conn.executemany(sql, rows)
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+    
+    def _load_daily_totals(self) -> Dict[str, float]:
+        """Per-day water totals, read from the database once (call with _lock held)"""
+        if self._daily_totals is None:
+            self._daily_totals = dict(self.conn.execute(
+                "SELECT date, SUM(amount_ml) FROM water_intake GROUP BY date"
+            ).fetchall())
+        return self._daily_totals
+    
     def _get_daily_water(self, date: str) -> int:
         """Get daily water intake total"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT SUM(amount_ml) FROM water_intake WHERE date = ?
-            """, (date,))
-            result = cursor.fetchone()
-            conn.close()
-            return result[0] or 0
+            with self._lock:
+                return self._load_daily_totals().get(date) or 0
         except:
             return 0
     
@@ -98,14 +151,11 @@ class HealthModule:
             duration = params.get('duration', 30)  # minutes
             date = params.get('date', datetime.now().date().isoformat())
             
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO exercise (activity, duration_minutes, date, created_at)
-                VALUES (?, ?, ?, ?)
-            """, (activity, duration, date, datetime.now().isoformat()))
-            conn.commit()
-            conn.close()
+            with self._lock:
+                self.conn.execute("""
+                    INSERT INTO exercise (activity, duration_minutes, date, created_at)
+                    VALUES (?, ?, ?, ?)
+                """, (activity, duration, date, datetime.now().isoformat()))
             
             return f"Logged {duration} minutes of {activity}"
         
@@ -113,25 +163,41 @@ class HealthModule:
             logger.error(f"Error logging exercise: {e}")
             return f"Error: {e}"
     
+    def log_exercise_bulk(self, entries: List[Dict]) -> int:
+        """Log many exercise entries in one transaction; returns how many were logged"""
+        try:
+            now = datetime.now().isoformat()
+            today = datetime.now().date().isoformat()
+            rows = [
+                (e.get('activity', 'Exercise'), e.get('duration', 30), e.get('date', today), now)
+                for e in entries
+            ]
+            
+            with self._lock:
+                self._insert_many("""
+                    INSERT INTO exercise (activity, duration_minutes, date, created_at)
+                    VALUES (?, ?, ?, ?)
+                """, rows)
+            return len(rows)
+        
+        except Exception as e:
+            logger.error(f"Error logging exercise: {e}")
+            return 0
+    
     def get_health_stats(self) -> Dict:
         """Get health statistics"""
         try:
             today = datetime.now().date().isoformat()
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Daily water
-            cursor.execute("SELECT SUM(amount_ml) FROM water_intake WHERE date = ?", (today,))
-            daily_water = cursor.fetchone()[0] or 0
-            
-            # Weekly exercise minutes
             week_ago = (datetime.now() - timedelta(days=7)).date().isoformat()
-            cursor.execute("""
-                SELECT SUM(duration_minutes) FROM exercise WHERE date >= ?
-            """, (week_ago,))
-            weekly_exercise = cursor.fetchone()[0] or 0
             
-            conn.close()
+            with self._lock:
+                # Daily water
+                daily_water = self._load_daily_totals().get(today) or 0
+                
+                # Weekly exercise minutes
+                weekly_exercise = self.conn.execute("""
+                    SELECT SUM(duration_minutes) FROM exercise WHERE date >= ?
+                """, (week_ago,)).fetchone()[0] or 0
             
             return {
                 'daily_water_ml': daily_water,
@@ -3,52 +3,159 @@ Input Automation Module
 Handles keyboard and mouse automation - typing, clicking, searching, navigation
 """
 
+import functools
 import logging
 import time
-from typing import Dict, Optional
-import pygetwindow as gw
+from typing import Callable, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
-# Keyboard and Mouse Automation
-try:
-    import pyautogui
-    import keyboard
-    INPUT_AUTOMATION_AVAILABLE = True
+# Keyboard and mouse packages are imported by _input_available() on first use: they
+# probe the display server on import, and most sessions never automate input
+pyautogui = None
+keyboard = None
+gw = None
+pyperclip = None
+INPUT_AUTOMATION_AVAILABLE: Optional[bool] = None  # unknown until the first input action
+
+# Longest wait for a focused window when a caller asks for one (wait_focus)
+FOCUS_TIMEOUT = 0.3
+# Longest wait for the search box template to appear after Ctrl+F
+SEARCH_BOX_TIMEOUT = 1.0
+# Seconds a cached screen size is trusted before asking the display server again
+SCREEN_SIZE_TTL = 30
+# Texts longer than this are pasted unless a typing speed is given
+FAST_TYPE_MIN_CHARS = 100
+# Mouse moves longer than this are played back from a precomputed path
+SMOOTH_MOVE_MIN_DURATION = 0.2
+# Points per second of a precomputed mouse path
+SMOOTH_MOVE_RATE = 60
+
+def _smooth_path(x0: int, y0: int, x1: int, y1: int, n: int) -> List[Tuple[int, int]]:
+    """n points from (x0, y0) to (x1, y1), eased in and out (smoothstep)"""
+    dx, dy = x1 - x0, y1 - y0
+    path = []
+    for i in range(1, n + 1):
+        t = i / n
+        s = t * t * (3 - 2 * t)
+        path.append((round(x0 + dx * s), round(y0 + dy * s)))
+    return path
+
+def _input_available() -> bool:
+    """Import the input packages on the first call; True if pyautogui and keyboard are usable"""
+    global pyautogui, keyboard, gw, pyperclip, INPUT_AUTOMATION_AVAILABLE
+    if INPUT_AUTOMATION_AVAILABLE is not None:
+        return INPUT_AUTOMATION_AVAILABLE
+    
+    # Keyboard and Mouse Automation
+    try:
+        import pyautogui as _pyautogui
+        import keyboard as _keyboard
+    except ImportError:
+        logger.warning("pyautogui or keyboard not installed. Input automation will be limited.")
+        INPUT_AUTOMATION_AVAILABLE = False
+        return False
+    
     # Safety settings
-    pyautogui.PAUSE = 0.1  # Small pause between actions
-    pyautogui.FAILSAFE = True  # Move mouse to corner to abort
-except ImportError:
-    INPUT_AUTOMATION_AVAILABLE = False
-    logger.warning("pyautogui or keyboard not installed. Input automation will be limited.")
+    _pyautogui.PAUSE = 0.1  # Small pause between actions
+    _pyautogui.FAILSAFE = True  # Move mouse to corner to abort
+    pyautogui, keyboard = _pyautogui, _keyboard
+    
+    try:
+        import pygetwindow as gw
+    except ImportError:
+        logger.warning("pygetwindow not installed. Focus checks will be skipped.")
+    
+    try:
+        import pyperclip
+    except ImportError:
+        logger.warning("pyperclip not installed. Fast typing will use keyboard.write instead of pasting.")
+    
+    INPUT_AUTOMATION_AVAILABLE = True
+    return True
 
 class InputAutomationModule:
     """Handles keyboard and mouse automation like a human"""
     
     def __init__(self, memory_module=None):
         self.memory_module = memory_module
+        # Last pyautogui.size() result and when it was read (time.monotonic)
+        self._screen_size = None
+        self._screen_size_ts = 0.0
+    
+    def _wait_for_focus(self, params: Dict):
+        """With params['wait_focus'], wait (up to FOCUS_TIMEOUT) until some titled window is active"""
+        if not params.get('wait_focus', False) or gw is None:
+            return
+        
+        deadline = time.monotonic() + FOCUS_TIMEOUT
+        delay = 0.01
+        while time.monotonic() < deadline:
+            try:
+                w = gw.getActiveWindow()
+                if w and w.title:
+                    return
+            except Exception:
+                # getActiveWindow is not implemented on every platform
+                return
+            time.sleep(delay)
+            delay = min(delay * 2, 0.08)
+    
+    def _paste(self, text: str):
+        """Enter text in one clipboard paste, restoring the previous clipboard afterwards"""
+        if pyperclip is None:
+            keyboard.write(text)
+            return
+        
+        try:
+            previous = pyperclip.paste()
+        except Exception:
+            previous = None
+        pyperclip.copy(text)
+        # pyautogui.PAUSE after the hotkey gives the app time to read the clipboard
+        pyautogui.hotkey('ctrl', 'v')
+        if previous is not None:
+            pyperclip.copy(previous)
+    
+    def _wait_for_search_box(self, template: Optional[str]):
+        """Wait until the search box template is on screen, or a short fixed delay without one"""
+        if not template:
+            time.sleep(0.05)
+            return
+        
+        deadline = time.monotonic() + SEARCH_BOX_TIMEOUT
+        while time.monotonic() < deadline:
+            try:
+                # Older pyautogui returns None, newer raises ImageNotFoundException
+                if pyautogui.locateOnScreen(template):
+                    return
+            except Exception:
+                pass
+            time.sleep(0.05)
     
     def type_text(self, params: Dict) -> str:
         """Type text using keyboard (simulates human typing)"""
-        if not INPUT_AUTOMATION_AVAILABLE:
+        if not _input_available():
             return "Keyboard automation not available. Install: pip install pyautogui keyboard"
         
         try:
             text = params.get('text', '')
             speed = params.get('speed', 0.05)  # Seconds per character (human-like)
+            mode = params.get('mode', 'human')  # 'fast' pastes the whole text at once
             press_enter = params.get('press_enter', False)
             
             if not text:
                 return "Error: No text provided to type"
             
-            # Wait a moment for focus
-            time.sleep(0.5)
+            self._wait_for_focus(params)
             
-            # Type text character by character (human-like)
-            pyautogui.write(text, interval=speed)
+            if mode == 'fast' or (len(text) > FAST_TYPE_MIN_CHARS and 'speed' not in params):
+                self._paste(text)
+            else:
+                # Type text character by character (human-like)
+                pyautogui.write(text, interval=speed)
             
             if press_enter:
-                time.sleep(0.2)
                 pyautogui.press('enter')
             
             if self.memory_module:
@@ -65,13 +172,15 @@ class InputAutomationModule:
     
     def press_key(self, params: Dict) -> str:
         """Press keyboard key or combination"""
-        if not INPUT_AUTOMATION_AVAILABLE:
+        if not _input_available():
             return "Keyboard automation not available"
         
         try:
             key = params.get('key', '')
             keys = params.get('keys', [])  # For combinations like ['ctrl', 'c']
             
+            self._wait_for_focus(params)
+            
             if keys:
                 # Press key combination
                 pyautogui.hotkey(*keys)
@@ -88,7 +197,7 @@ class InputAutomationModule:
     
     def click_mouse(self, params: Dict) -> str:
         """Click mouse at position or current location"""
-        if not INPUT_AUTOMATION_AVAILABLE:
+        if not _input_available():
             return "Mouse automation not available"
         
         try:
@@ -119,7 +228,7 @@ class InputAutomationModule:
     
     def move_mouse(self, params: Dict) -> str:
         """Move mouse to position"""
-        if not INPUT_AUTOMATION_AVAILABLE:
+        if not _input_available():
             return "Mouse automation not available"
         
         try:
@@ -130,16 +239,32 @@ class InputAutomationModule:
             if x is None or y is None:
                 return "Error: x and y coordinates required"
             
-            pyautogui.moveTo(x, y, duration=duration)
+            if duration > SMOOTH_MOVE_MIN_DURATION:
+                self._play_path(x, y, duration)
+            else:
+                pyautogui.moveTo(x, y, duration=duration)
             return f"Moved mouse to ({x}, {y})"
         
         except Exception as e:
             logger.error(f"Error moving mouse: {e}")
             return f"Error: {e}"
     
+    def _play_path(self, x: int, y: int, duration: float):
+        """Move the mouse to (x, y) along a precomputed path, paced against a fixed schedule"""
+        x0, y0 = pyautogui.position()
+        n = max(2, int(duration * SMOOTH_MOVE_RATE))
+        interval = duration / n
+        start = time.monotonic()
+        for i, (px, py) in enumerate(_smooth_path(x0, y0, x, y, n), 1):
+            # _pause=False: pyautogui.PAUSE would otherwise follow every step
+            pyautogui.moveTo(px, py, _pause=False)
+            delay = start + i * interval - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+    
     def search_in_application(self, params: Dict) -> str:
         """Search in current application using Ctrl+F"""
-        if not INPUT_AUTOMATION_AVAILABLE:
+        if not _input_available():
             return "Keyboard automation not available"
         
         try:
@@ -148,13 +273,12 @@ class InputAutomationModule:
                 return "Error: Search text required"
             
             # Press Ctrl+F to open search
-            time.sleep(0.3)
+            self._wait_for_focus(params)
             pyautogui.hotkey('ctrl', 'f')
-            time.sleep(0.5)
+            self._wait_for_search_box(params.get('search_box_image'))
             
             # Type search text
             pyautogui.write(search_text, interval=0.05)
-            time.sleep(0.3)
             
             # Press Enter to search (or Escape to close, depending on app)
             # Most apps use Enter to find, some use Escape to close
@@ -169,7 +293,7 @@ class InputAutomationModule:
     
     def navigate_with_keyboard(self, params: Dict) -> str:
         """Navigate using keyboard shortcuts"""
-        if not INPUT_AUTOMATION_AVAILABLE:
+        if not _input_available():
             return "Keyboard automation not available"
         
         try:
@@ -189,7 +313,7 @@ class InputAutomationModule:
     
     def perform_sequence(self, params: Dict) -> str:
         """Perform a sequence of keyboard/mouse actions"""
-        if not INPUT_AUTOMATION_AVAILABLE:
+        if not _input_available():
             return "Input automation not available"
         
         try:
@@ -199,18 +323,9 @@ class InputAutomationModule:
                 return "Error: No actions provided"
             
             results = []
-            for action in actions:
-                action_type = action.get('type')
-                
-                if action_type == 'type':
-                    self.type_text(action.get('params', {}))
-                elif action_type == 'click':
-                    self.click_mouse(action.get('params', {}))
-                elif action_type == 'press':
-                    self.press_key(action.get('params', {}))
-                elif action_type == 'wait':
-                    time.sleep(action.get('duration', 1))
-                
+            for action_type, step in self._compile_sequence(actions):
+                if step is not None:
+                    step()
                 results.append(f"Executed: {action_type}")
             
             return f"Performed {len(actions)} actions: {', '.join(results[:5])}"
@@ -219,9 +334,29 @@ class InputAutomationModule:
             logger.error(f"Error performing sequence: {e}")
             return f"Error: {e}"
     
+    def _compile_sequence(self, actions: List[Dict]) -> List[Tuple[Optional[str], Optional[Callable]]]:
+        """Resolve every sequence step to (action_type, callable) before any of them runs"""
+        handlers = {
+            'type': self.type_text,
+            'click': self.click_mouse,
+            'press': self.press_key,
+        }
+        compiled = []
+        for action in actions:
+            action_type = action.get('type')
+            if action_type == 'wait':
+                step = functools.partial(time.sleep, action.get('duration', 1))
+            elif action_type in handlers:
+                step = functools.partial(handlers[action_type], action.get('params', {}))
+            else:
+                # Unknown steps are reported but do nothing, as before
+                step = None
+            compiled.append((action_type, step))
+        return compiled
+    
     def get_mouse_position(self) -> Dict:
         """Get current mouse position"""
-        if not INPUT_AUTOMATION_AVAILABLE:
+        if not _input_available():
             return {'error': 'Mouse automation not available'}
         
         try:
@@ -233,11 +368,15 @@ class InputAutomationModule:
     
     def get_screen_size(self) -> Dict:
         """Get screen size"""
-        if not INPUT_AUTOMATION_AVAILABLE:
+        if not _input_available():
             return {'error': 'Screen info not available'}
         
         try:
-            width, height = pyautogui.size()
+            now = time.monotonic()
+            if self._screen_size is None or now - self._screen_size_ts > SCREEN_SIZE_TTL:
+                self._screen_size = tuple(pyautogui.size())
+                self._screen_size_ts = now
+            width, height = self._screen_size
             return {'width': width, 'height': height}
         except Exception as e:
             logger.error(f"Error getting screen size: {e}")
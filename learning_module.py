@@ -5,6 +5,9 @@ Handles study session tracking, flashcards, note-taking, and research
 
 import os
 import logging
+import queue
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Dict, Optional, List
@@ -12,6 +15,17 @@ import sqlite3
 
 logger = logging.getLogger(__name__)
 
+# Hot statements as constants: sqlite3 caches compiled statements per connection by SQL text
+_SQL_INSERT_SESSION = (
+    "INSERT INTO study_sessions (subject, duration_minutes, notes, date, created_at) VALUES (?, ?, ?, ?, ?)"
+)
+# Idle read-only connections kept for get_flashcards/get_study_stats; extra ones are closed
+READ_POOL_SIZE = 2
+
+# Columns of the flashcard rows returned by get_flashcards, in SELECT order
+_FLASHCARD_KEYS = ('id', 'front', 'back', 'category', 'difficulty', 'times_studied')
+_SQL_INSERT_FLASHCARD = "INSERT INTO flashcards (front, back, category, created_at) VALUES (?, ?, ?, ?)"
+
 class LearningModule:
     """Handles learning and study-related operations"""
     
@@ -23,13 +37,21 @@ class LearningModule:
         
         # Initialize learning database
         self.db_path = Path(__file__).parent / 'learning.db'
+        # One autocommit connection shared by all writers, serialized by the lock;
+        # readers borrow read-only connections so they never wait on a write (WAL)
+        self.conn = None
+        self._lock = threading.Lock()
+        self._read_pool = queue.Queue(maxsize=READ_POOL_SIZE)
         self._init_database()
     
     def _init_database(self):
         """Initialize learning database tables"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute("PRAGMA temp_store=MEMORY")
+            cursor = self.conn.cursor()
             
             # Study sessions table
             cursor.execute("""
@@ -57,12 +79,30 @@ class LearningModule:
                 )
             """)
             
-            conn.commit()
-            conn.close()
+            # get_flashcards filters by category and orders by last_studied, created_at
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_flashcards_cat_last ON flashcards(category, last_studied, created_at DESC)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_flashcards_last ON flashcards(last_studied, created_at DESC)")
+            
             logger.info("Learning database initialized")
         except Exception as e:
             logger.error(f"Error initializing learning database: {e}")
     
+    @contextmanager
+    def _reader(self):
+        """Borrow a read-only connection from the pool, opening one if none is idle"""
+        try:
+            conn = self._read_pool.get_nowait()
+        except queue.Empty:
+            uri = self.db_path.resolve().as_uri() + '?mode=ro'
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        try:
+            yield conn
+        finally:
+            try:
+                self._read_pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+    
     def start_study_session(self, params: Dict) -> str:
         """Start a study session"""
         try:
@@ -92,14 +132,8 @@ class LearningModule:
             duration = params.get('duration', 0)  # in minutes
             notes = params.get('notes', '')
             
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO study_sessions (subject, duration_minutes, notes, date, created_at)
-                VALUES (?, ?, ?, ?, ?)
-            """, (subject, duration, notes, datetime.now().date().isoformat(), datetime.now().isoformat()))
-            conn.commit()
-            conn.close()
+            with self._lock:
+                self.conn.execute(_SQL_INSERT_SESSION, (subject, duration, notes, datetime.now().date().isoformat(), datetime.now().isoformat()))
             
             if self.memory_module:
                 self.memory_module.log_activity('study_session_end', {
@@ -123,14 +157,8 @@ class LearningModule:
             if not front or not back:
                 return "Error: Both 'front' and 'back' are required"
             
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO flashcards (front, back, category, created_at)
-                VALUES (?, ?, ?, ?)
-            """, (front, back, category, datetime.now().isoformat()))
-            conn.commit()
-            conn.close()
+            with self._lock:
+                self.conn.execute(_SQL_INSERT_FLASHCARD, (front, back, category, datetime.now().isoformat()))
             
             return f"Created flashcard in category '{category}': {front}"
         
@@ -138,39 +166,50 @@ class LearningModule:
             logger.error(f"Error creating flashcard: {e}")
             return f"Error: {e}"
     
-    def get_flashcards(self, category: Optional[str] = None) -> List[Dict]:
-        """Get flashcards, optionally filtered by category"""
+    def create_flashcards_bulk(self, cards: List[Dict]) -> int:
+        """Create many flashcards (e.g. an imported deck) in one transaction; returns how many were created"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            now = datetime.now().isoformat()
+            rows = [
+                (c['front'], c['back'], c.get('category', 'General'), now)
+                for c in cards if c.get('front') and c.get('back')
+            ]
             
-            if category:
-                cursor.execute("""
-                    SELECT id, front, back, category, difficulty, times_studied
-                    FROM flashcards
-                    WHERE category = ?
-                    ORDER BY last_studied ASC, created_at DESC
-                """, (category,))
-            else:
-                cursor.execute("""
-                    SELECT id, front, back, category, difficulty, times_studied
-                    FROM flashcards
-                    ORDER BY last_studied ASC, created_at DESC
-                """)
+            # The connection autocommits, so open the transaction explicitly: one commit for all rows
+            with self._lock:
+                self.conn.execute("BEGIN")
+                try:
+                    self.conn.executemany(_SQL_INSERT_FLASHCARD, rows)
+                    self.conn.execute("COMMIT")
+                except Exception:
+                    self.conn.execute("ROLLBACK")
+                    raise
             
-            flashcards = []
-            for row in cursor.fetchall():
-                flashcards.append({
-                    'id': row[0],
-                    'front': row[1],
-                    'back': row[2],
-                    'category': row[3],
-                    'difficulty': row[4],
-                    'times_studied': row[5]
-                })
+            return len(rows)
+        
+        except Exception as e:
+            logger.error(f"Error creating flashcards: {e}")
+            return 0
+    
+    def get_flashcards(self, category: Optional[str] = None) -> List[Dict]:
+        """Get flashcards, optionally filtered by category"""
+        try:
+            with self._reader() as conn:
+                if category:
+                    rows = conn.execute("""
+                        SELECT id, front, back, category, difficulty, times_studied
+                        FROM flashcards
+                        WHERE category = ?
+                        ORDER BY last_studied ASC, created_at DESC
+                    """, (category,)).fetchall()
+                else:
+                    rows = conn.execute("""
+                        SELECT id, front, back, category, difficulty, times_studied
+                        FROM flashcards
+                        ORDER BY last_studied ASC, created_at DESC
+                    """).fetchall()
             
-            conn.close()
-            return flashcards
+            return [dict(zip(_FLASHCARD_KEYS, row)) for row in rows]
         
         except Exception as e:
             logger.error(f"Error getting flashcards: {e}")
@@ -183,17 +222,21 @@ class LearningModule:
             content = params.get('content', '')
             category = params.get('category', 'General')
             
-            # Create category folder
             category_dir = self.notes_dir / category
-            category_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Create markdown file
             note_file = category_dir / f"{title}.md"
-            with open(note_file, 'w', encoding='utf-8') as f:
-                f.write(f"# {title}\n\n")
-                f.write(f"**Date:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-                f.write(f"**Category:** {category}\n\n---\n\n")
-                f.write(content)
+            body = (
+                f"# {title}\n\n"
+                f"**Date:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+                f"**Category:** {category}\n\n---\n\n"
+                f"{content}"
+            )
+            
+            # Create markdown file in a single write; create the category folder only when missing
+            try:
+                note_file.write_text(body, encoding='utf-8')
+            except FileNotFoundError:
+                category_dir.mkdir(parents=True, exist_ok=True)
+                note_file.write_text(body, encoding='utf-8')
             
             if self.memory_module:
                 self.memory_module.log_activity('note_saved', {
@@ -253,22 +296,20 @@ class LearningModule:
     def get_study_stats(self) -> Dict:
         """Get study statistics"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Total study time
-            cursor.execute("SELECT SUM(duration_minutes) FROM study_sessions")
-            total_minutes = cursor.fetchone()[0] or 0
-            
-            # Study sessions count
-            cursor.execute("SELECT COUNT(*) FROM study_sessions")
-            session_count = cursor.fetchone()[0]
-            
-            # Flashcard count
-            cursor.execute("SELECT COUNT(*) FROM flashcards")
-            flashcard_count = cursor.fetchone()[0]
-            
-            conn.close()
+            with self._reader() as conn:
+                cursor = conn.cursor()
+                
+                # Total study time
+                cursor.execute("SELECT SUM(duration_minutes) FROM study_sessions")
+                total_minutes = cursor.fetchone()[0] or 0
+                
+                # Study sessions count
+                cursor.execute("SELECT COUNT(*) FROM study_sessions")
+                session_count = cursor.fetchone()[0]
+                
+                # Flashcard count
+                cursor.execute("SELECT COUNT(*) FROM flashcards")
+                flashcard_count = cursor.fetchone()[0]
             
             return {
                 'total_study_minutes': total_minutes,
@@ -4,33 +4,105 @@ Stores chats, tasks, reminders, and activity logs
 """
 
 import sqlite3
+import atexit
 import logging
+import threading
+import time
 import json
+from collections import deque
 from datetime import datetime
 from typing import List, Dict, Optional
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Fast JSON for activity log details
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def _dumps(obj) -> str:
+    """json.dumps via orjson when available, falling back for values orjson rejects"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            pass
+    return json.dumps(obj)
+
+_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+# Hot statements, shared by every method that runs them: sqlite3 caches compiled
+# statements per connection keyed on the exact SQL text
+_SQL_INSERT_CHAT = "INSERT INTO chat_history (role, content, language) VALUES (?, ?, ?)"
+_SQL_INSERT_LOG = "INSERT INTO activity_logs (action_type, details) VALUES (?, ?)"
+_SQL_INSERT_TASK = "INSERT INTO tasks (task_text, due_date) VALUES (?, ?)"
+_SQL_INSERT_REMINDER = "INSERT INTO reminders (reminder_text, reminder_time) VALUES (?, ?)"
+_SQL_MARK_TRIGGERED = "UPDATE reminders SET triggered = 1 WHERE id = ?"
+
+# Activity logs are buffered and written together once LOG_FLUSH_SIZE rows are
+# waiting or LOG_FLUSH_INTERVAL seconds after the first one, whichever comes first
+LOG_FLUSH_SIZE = 100
+LOG_FLUSH_INTERVAL = 2.0
+
 class MemoryModule:
     """Manages persistent memory using SQLite database"""
     
     def __init__(self, db_path: str = 'assistant_memory.db'):
         self.db_path = db_path
+        # One connection per thread, opened on first use and reused afterwards
+        self._local = threading.local()
+        # (action_type, details_json) rows not yet written; set when the buffer has rows
+        # so one long-lived flusher thread (and its connection) writes them
+        self._log_buffer = deque()
+        self._log_lock = threading.Lock()
+        self._log_pending = threading.Event()
+        # Set by init_database when the chat_history_fts index could be created
+        self._fts_available = False
         self.init_database()
+        threading.Thread(target=self._log_flusher, name='activity-log', daemon=True).start()
+        atexit.register(self.flush_logs)
     
     def get_connection(self):
-        """Get database connection"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+        """Get this thread's database connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Autocommit: single statements commit on their own, batches open BEGIN explicitly
+            conn = sqlite3.connect(self.db_path, isolation_level=None)
+            conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+            conn.execute("PRAGMA synchronous=NORMAL")  # Safe with WAL, far fewer fsyncs
+            conn.execute("PRAGMA mmap_size=268435456")
+            conn.execute("PRAGMA busy_timeout=5000")  # Wait for another thread's write instead of failing
+            conn.execute("PRAGMA cache_size=-20000")  # ~20 MB page cache
+            conn.execute("PRAGMA temp_store=MEMORY")
+            self._local.conn = conn
+        elif conn.in_transaction:
+            # A previous call on this thread failed before committing; drop its partial writes
+            conn.rollback()
         return conn
     
+    def _executemany(self, sql: str, rows: List[tuple]):
+        """executemany on this thread's connection in one explicit transaction"""
+        conn = self.get_connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(sql, rows)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    
     def init_database(self):
         """Initialize database tables"""
         try:
             conn = self.get_connection()
             cursor = conn.cursor()
             
+            # WAL lets readers run concurrently with a writer (persists in the db file)
+            cursor.execute("PRAGMA journal_mode=WAL")
+            
             # Chat history table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS chat_history (
@@ -75,29 +147,79 @@ class MemoryModule:
                 )
             ''')
             
-            conn.commit()
-            conn.close()
+            # Indexes matching the hot WHERE/ORDER BY clauses, so reads skip the scan and sort
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_chat_ts ON chat_history(timestamp, id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_tasks_status_created ON tasks(status, created_at)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_tasks_created ON tasks(created_at)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_reminders_triggered_time ON reminders(triggered, reminder_time)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_logs_ts ON activity_logs(timestamp, id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_logs_type_ts ON activity_logs(action_type, timestamp)")
+            
+            self._init_chat_fts(cursor)
+            
             logger.info("Database initialized successfully")
         
         except Exception as e:
             logger.error(f"Error initializing database: {e}")
     
+    def _init_chat_fts(self, cursor):
+        """Set up the trigram full-text index used by search_chat_history (needs SQLite 3.34+)"""
+        try:
+            exists = cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'chat_history_fts'"
+            ).fetchone()
+            
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS chat_history_fts USING fts5(
+                    content, content='chat_history', content_rowid='id', tokenize='trigram'
+                )
+            ''')
+            
+            # Keep the index in sync with the chat_history table
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS chat_history_ai AFTER INSERT ON chat_history BEGIN
+                    INSERT INTO chat_history_fts(rowid, content) VALUES (new.id, new.content);
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS chat_history_ad AFTER DELETE ON chat_history BEGIN
+                    INSERT INTO chat_history_fts(chat_history_fts, rowid, content)
+                    VALUES ('delete', old.id, old.content);
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS chat_history_au AFTER UPDATE ON chat_history BEGIN
+                    INSERT INTO chat_history_fts(chat_history_fts, rowid, content)
+                    VALUES ('delete', old.id, old.content);
+                    INSERT INTO chat_history_fts(rowid, content) VALUES (new.id, new.content);
+                END
+            ''')
+            
+            # Index chats saved before the table existed
+            if not exists:
+                cursor.execute("INSERT INTO chat_history_fts(chat_history_fts) VALUES ('rebuild')")
+            
+            self._fts_available = True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Chat full-text search unavailable, using LIKE: {e}")
+    
     def add_chat_entry(self, role: str, content: str, language: str = 'en'):
         """Add a chat entry to history"""
         try:
             conn = self.get_connection()
             cursor = conn.cursor()
             
-            cursor.execute('''
-                INSERT INTO chat_history (role, content, language)
-                VALUES (?, ?, ?)
-            ''', (role, content, language))
-            
-            conn.commit()
-            conn.close()
+            cursor.execute(_SQL_INSERT_CHAT, (role, content, language))
         except Exception as e:
             logger.error(f"Error adding chat entry: {e}")
     
+    def add_chat_entries(self, entries: List[tuple]):
+        """Add several (role, content, language) chat entries in one transaction"""
+        try:
+            self._executemany(_SQL_INSERT_CHAT, entries)
+        except Exception as e:
+            logger.error(f"Error adding chat entries: {e}")
+    
     def get_recent_chats(self, limit: int = 20) -> List[Dict]:
         """Get recent chat history"""
         try:
@@ -107,22 +229,13 @@ class MemoryModule:
             cursor.execute('''
                 SELECT role, content, language, timestamp
                 FROM chat_history
-                ORDER BY timestamp DESC
+                ORDER BY timestamp DESC, id DESC
                 LIMIT ?
             ''', (limit,))
             
-            rows = cursor.fetchall()
-            chats = []
-            for row in rows:
-                chats.append({
-                    'role': row['role'],
-                    'content': row['content'],
-                    'language': row['language'],
-                    'timestamp': row['timestamp']
-                })
-            
-            conn.close()
-            return list(reversed(chats))  # Return in chronological order
+            chats = [dict(row) for row in cursor]
+            chats.reverse()  # Return in chronological order
+            return chats
         
         except Exception as e:
             logger.error(f"Error getting recent chats: {e}")
@@ -134,26 +247,25 @@ class MemoryModule:
             conn = self.get_connection()
             cursor = conn.cursor()
             
-            cursor.execute('''
-                SELECT role, content, language, timestamp
-                FROM chat_history
-                WHERE content LIKE ?
-                ORDER BY timestamp DESC
-                LIMIT 50
-            ''', (f'%{query}%',))
-            
-            rows = cursor.fetchall()
-            results = []
-            for row in rows:
-                results.append({
-                    'role': row['role'],
-                    'content': row['content'],
-                    'language': row['language'],
-                    'timestamp': row['timestamp']
-                })
-            
-            conn.close()
-            return results
+            # Trigrams need at least 3 characters; shorter queries scan with LIKE
+            if self._fts_available and len(query) >= 3:
+                cursor.execute('''
+                    SELECT ch.role, ch.content, ch.language, ch.timestamp
+                    FROM chat_history ch JOIN chat_history_fts f ON f.rowid = ch.id
+                    WHERE chat_history_fts MATCH ?
+                    ORDER BY ch.timestamp DESC, ch.id DESC
+                    LIMIT 50
+                ''', ('"{}"'.format(query.replace('"', '""')),))
+            else:
+                cursor.execute('''
+                    SELECT role, content, language, timestamp
+                    FROM chat_history
+                    WHERE content LIKE ?
+                    ORDER BY timestamp DESC, id DESC
+                    LIMIT 50
+                ''', (f'%{query}%',))
+            
+            return [dict(row) for row in cursor]
         
         except Exception as e:
             logger.error(f"Error searching chat history: {e}")
@@ -165,14 +277,9 @@ class MemoryModule:
             conn = self.get_connection()
             cursor = conn.cursor()
             
-            cursor.execute('''
-                INSERT INTO tasks (task_text, due_date)
-                VALUES (?, ?)
-            ''', (task_text, due_date))
+            cursor.execute(_SQL_INSERT_TASK, (task_text, due_date))
             
             task_id = cursor.lastrowid
-            conn.commit()
-            conn.close()
             
             self.log_activity('add_task', {'task_id': task_id, 'task_text': task_text})
             return task_id
@@ -201,20 +308,7 @@ class MemoryModule:
                     ORDER BY created_at DESC
                 ''')
             
-            rows = cursor.fetchall()
-            tasks = []
-            for row in rows:
-                tasks.append({
-                    'id': row['id'],
-                    'task_text': row['task_text'],
-                    'status': row['status'],
-                    'due_date': row['due_date'],
-                    'created_at': row['created_at'],
-                    'completed_at': row['completed_at']
-                })
-            
-            conn.close()
-            return tasks
+            return [dict(row) for row in cursor]
         
         except Exception as e:
             logger.error(f"Error getting tasks: {e}")
@@ -248,10 +342,7 @@ class MemoryModule:
                     WHERE id = ?
                 ''', params)
                 
-                conn.commit()
                 self.log_activity('update_task', {'task_id': task_id, 'status': status})
-            
-            conn.close()
         
         except Exception as e:
             logger.error(f"Error updating task: {e}")
@@ -264,9 +355,6 @@ class MemoryModule:
             
             cursor.execute('DELETE FROM tasks WHERE id = ?', (task_id,))
             
-            conn.commit()
-            conn.close()
-            
             self.log_activity('delete_task', {'task_id': task_id})
         
         except Exception as e:
@@ -278,14 +366,9 @@ class MemoryModule:
             conn = self.get_connection()
             cursor = conn.cursor()
             
-            cursor.execute('''
-                INSERT INTO reminders (reminder_text, reminder_time)
-                VALUES (?, ?)
-            ''', (reminder_text, reminder_time))
+            cursor.execute(_SQL_INSERT_REMINDER, (reminder_text, reminder_time))
             
             reminder_id = cursor.lastrowid
-            conn.commit()
-            conn.close()
             
             self.log_activity('add_reminder', {
                 'reminder_id': reminder_id,
@@ -319,18 +402,10 @@ class MemoryModule:
                     ORDER BY reminder_time ASC
                 ''')
             
-            rows = cursor.fetchall()
-            reminders = []
-            for row in rows:
-                reminders.append({
-                    'id': row['id'],
-                    'reminder_text': row['reminder_text'],
-                    'reminder_time': row['reminder_time'],
-                    'triggered': bool(row['triggered']),
-                    'created_at': row['created_at']
-                })
+            reminders = [dict(row) for row in cursor]
+            for reminder in reminders:
+                reminder['triggered'] = bool(reminder['triggered'])
             
-            conn.close()
             return reminders
         
         except Exception as e:
@@ -343,65 +418,87 @@ class MemoryModule:
             conn = self.get_connection()
             cursor = conn.cursor()
             
-            cursor.execute('''
-                UPDATE reminders
-                SET triggered = 1
-                WHERE id = ?
-            ''', (reminder_id,))
-            
-            conn.commit()
-            conn.close()
+            cursor.execute(_SQL_MARK_TRIGGERED, (reminder_id,))
         
         except Exception as e:
             logger.error(f"Error marking reminder as triggered: {e}")
     
     def log_activity(self, action_type: str, details: Dict):
-        """Log an activity"""
+        """Log an activity (buffered; see flush_logs)"""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
+            details_json = _dumps(details)
             
-            details_json = json.dumps(details)
+            with self._log_lock:
+                self._log_buffer.append((action_type, details_json))
+                full = len(self._log_buffer) >= LOG_FLUSH_SIZE
+                if not full:
+                    self._log_pending.set()
             
-            cursor.execute('''
-                INSERT INTO activity_logs (action_type, details)
-                VALUES (?, ?)
-            ''', (action_type, details_json))
-            
-            conn.commit()
-            conn.close()
+            if full:
+                self.flush_logs()
         
         except Exception as e:
             logger.error(f"Error logging activity: {e}")
     
+    def log_activities_bulk(self, entries: List[tuple]):
+        """Log several (action_type, details) activities and write them in one transaction"""
+        try:
+            rows = [(action_type, _dumps(details)) for action_type, details in entries]
+            with self._log_lock:
+                self._log_buffer.extend(rows)
+            self.flush_logs()
+        except Exception as e:
+            logger.error(f"Error logging activities: {e}")
+    
+    def _log_flusher(self):
+        """Write buffered activity logs LOG_FLUSH_INTERVAL seconds after the first one arrives"""
+        while True:
+            self._log_pending.wait()
+            time.sleep(LOG_FLUSH_INTERVAL)
+            self.flush_logs()
+    
+    def flush_logs(self):
+        """Write all buffered activity logs in one transaction"""
+        with self._log_lock:
+            self._log_pending.clear()
+            if not self._log_buffer:
+                return
+            rows = list(self._log_buffer)
+            self._log_buffer.clear()
+            
+            # Written under the lock so concurrent flushes keep the rows in order
+            try:
+                self._executemany(_SQL_INSERT_LOG, rows)
+            except Exception as e:
+                logger.error(f"Error writing {len(rows)} activity logs: {e}")
+    
     def get_activity_logs(self, limit: int = 100) -> List[Dict]:
         """Get activity logs"""
         try:
+            self.flush_logs()
             conn = self.get_connection()
             cursor = conn.cursor()
             
             cursor.execute('''
                 SELECT action_type, details, timestamp
                 FROM activity_logs
-                ORDER BY timestamp DESC
+                ORDER BY timestamp DESC, id DESC
                 LIMIT ?
             ''', (limit,))
             
-            rows = cursor.fetchall()
             logs = []
-            for row in rows:
+            for action_type, details, timestamp in cursor:
                 try:
-                    details = json.loads(row['details']) if row['details'] else {}
+                    details = _loads(details) if details else {}
                 except:
                     details = {}
                 
                 logs.append({
-                    'action_type': row['action_type'],
+                    'action_type': action_type,
                     'details': details,
-                    'timestamp': row['timestamp']
+                    'timestamp': timestamp
                 })
             
-            conn.close()
             return logs
         
         except Exception as e:
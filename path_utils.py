@@ -0,0 +1,17 @@
+"""
+Path helpers shared by the file-handling modules
+"""
+
+import os
+import functools
+from pathlib import Path
+
+
+@functools.lru_cache(maxsize=4096)
+def _absolute(path: str, cwd: str) -> Path:
+    """path with ~ expanded, joined onto cwd if relative (string work only, so safe to cache)"""
+    return Path(cwd, os.path.expanduser(path))
+
+def norm_path(path) -> Path:
+    """Path(path).expanduser().resolve(); symlinks are resolved on every call, never cached"""
+    return _absolute(str(path), os.getcwd()).resolve()
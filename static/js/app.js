@@ -313,11 +313,12 @@ async function sendMessage() {
             },
             body: JSON.stringify({
                 message: message,
-                language: currentLanguage
+                language: currentLanguage,
+                stream: true
             })
         });
         
-        const data = await response.json();
+        const data = await readChatStream(response, typingId);
         
         // Remove typing indicator
         removeTypingIndicator(typingId);
@@ -438,6 +439,47 @@ async function sendMessage() {
     }
 }
 
+// Read a streamed chat response, showing text deltas in the typing bubble
+async function readChatStream(response, typingId) {
+    const contentType = response.headers.get('Content-Type') || '';
+    if (!contentType.includes('text/event-stream')) {
+        return response.json();
+    }
+    
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let streamedText = '';
+    let result = { error: 'Connection closed before the response finished' };
+    
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        
+        buffer += decoder.decode(value, { stream: true });
+        const events = buffer.split('\n\n');
+        buffer = events.pop();
+        
+        for (const eventText of events) {
+            if (!eventText.startsWith('data: ')) continue;
+            const event = JSON.parse(eventText.slice(6));
+            
+            if (event.done) {
+                result = event;
+            } else if (event.delta) {
+                streamedText += event.delta;
+                const typingDiv = document.getElementById(typingId);
+                const target = typingDiv && typingDiv.querySelector('.flex-1');
+                if (target) {
+                    target.innerHTML = `<p class="text-cyan-100 leading-relaxed">${escapeHtml(streamedText)}</p>`;
+                }
+            }
+        }
+    }
+    
+    return result;
+}
+
 // Speak text using natural voice
 async function speakText(text, language = 'en') {
     try {
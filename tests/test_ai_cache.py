@@ -0,0 +1,173 @@
+"""Response cache tiers of AdvancedAIModule: exact, disk and semantic"""
+
+import threading
+import time
+
+import pytest
+
+import ai_advanced_module as am
+
+
+class FakeAgent:
+    """Stands in for GroqAgent, counting the completions it is asked for"""
+
+    client = object()
+
+    def __init__(self, delay: float = 0):
+        self.calls = 0
+        self.delay = delay
+
+    def run_task(self, prompt, system, context=None):
+        self.calls += 1
+        time.sleep(self.delay)
+        return f"reply {self.calls}"
+
+    def run_task_stream(self, prompt, system, context=None):
+        self.calls += 1
+        yield 'streamed '
+        yield f"reply {self.calls}"
+
+
+class FakeDisk(dict):
+    """diskcache.Cache's get/set, backed by a dict"""
+
+    def set(self, key, value, expire=None):
+        self[key] = value
+
+
+class RecordingSemanticCache:
+    """SemanticCache that never hits and records which namespaces were stored"""
+
+    def __init__(self):
+        self.namespaces = []
+
+    def get(self, namespace, text, threshold):
+        return None
+
+    def set(self, namespace, text, response, ttl):
+        self.namespaces.append(namespace[0])
+
+
+@pytest.fixture(autouse=True)
+def offline(monkeypatch):
+    """No disk cache and no embedding model unless a test installs one"""
+    monkeypatch.setattr(am, '_DISK', None)
+    monkeypatch.setattr(am, 'SEMANTIC_CACHE_AVAILABLE', False)
+
+
+@pytest.fixture
+def agent():
+    return FakeAgent()
+
+
+@pytest.fixture
+def ai(agent):
+    return am.AdvancedAIModule(agent)
+
+
+def test_miss_then_exact_hit(ai, agent):
+    first = ai.translate_text({'text': 'good morning'})
+    second = ai.translate_text({'text': 'good morning'})
+
+    assert first == second
+    assert agent.calls == 1
+
+
+def test_exact_parameters_are_part_of_the_key(ai, agent):
+    ai.translate_text({'text': 'good morning', 'target_language': 'urdu'})
+    ai.translate_text({'text': 'good morning', 'target_language': 'french'})
+
+    assert agent.calls == 2
+
+
+def test_exact_tier_expires(ai, agent, monkeypatch):
+    ai.cache = RecordingSemanticCache()
+    now = time.time()
+    ai.translate_text({'text': 'good morning'})
+
+    monkeypatch.setattr(am.time, 'time', lambda: now + ai.CACHE_TTL + 1)
+    ai.translate_text({'text': 'good morning'})
+
+    assert agent.calls == 2
+
+
+def test_exact_tier_is_bounded(ai, monkeypatch):
+    monkeypatch.setattr(ai, 'RECENT_MAX_ENTRIES', 3)
+    for i in range(10):
+        ai.translate_text({'text': f"sentence {i}"})
+
+    assert len(ai._recent) == 3
+
+
+def test_disk_hit_skips_groq(ai, agent, monkeypatch):
+    disk = FakeDisk()
+    monkeypatch.setattr(am, '_DISK', disk)
+    ai.translate_text({'text': 'good morning'})
+    assert len(disk) == 1
+
+    # A fresh instance has empty in-memory tiers, so only the disk can answer
+    fresh = am.AdvancedAIModule(agent)
+    assert fresh.translate_text({'text': 'good morning'}).endswith('reply 1')
+    assert agent.calls == 1
+
+
+def test_errors_are_not_cached(ai, agent, monkeypatch):
+    class Boom(Exception):
+        pass
+
+    succeed = agent.run_task
+
+    def fail(prompt, system, context=None):
+        agent.calls += 1
+        raise Boom('service down')
+
+    monkeypatch.setattr(am, '_TASK_ERRORS', am._TASK_ERRORS + (Boom,))
+    agent.run_task = fail
+    assert ai.translate_text({'text': 'good morning'}) == "Error: service down"
+
+    agent.run_task = succeed
+    assert ai.translate_text({'text': 'good morning'}).endswith('reply 2')
+
+
+def test_semantic_tier_only_for_free_text(ai):
+    ai.cache = RecordingSemanticCache()
+    ai.debug_code({'code': 'x = items[1]', 'error': 'IndexError'})
+    ai.generate_code({'description': 'reverse a list'})
+    ai.translate_text({'text': 'good morning'})
+    ai.summarize_document({'text': 'a long report'})
+
+    assert ai.cache.namespaces == ['summarize']
+
+
+def test_concurrent_identical_calls_share_one_request():
+    agent = FakeAgent(delay=0.2)
+    ai = am.AdvancedAIModule(agent)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(ai.translate_text({'text': 'hi there'})))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert agent.calls == 1
+    assert len(set(results)) == 1
+
+
+def test_stream_fills_and_reads_the_cache(ai, agent):
+    streamed = ''.join(ai.summarize_document({'text': 'a long report'}, stream=True))
+    cached = ''.join(ai.summarize_document({'text': 'a long report'}, stream=True))
+
+    assert streamed == cached
+    assert ai.summarize_document({'text': 'a long report'}) == streamed
+    assert agent.calls == 1
+
+
+def test_semantic_cache_expires(monkeypatch):
+    cache = am.SemanticCache()
+    now = time.time()
+    cache.set(('summarize',), 'text', 'answer', ttl=10)
+    assert cache.get(('summarize',), 'text', 0.9) == 'answer'
+
+    monkeypatch.setattr(am.time, 'time', lambda: now + 11)
+    assert cache.get(('summarize',), 'text', 0.9) is None
@@ -0,0 +1,152 @@
+"""AdvancedFileModule: batch renames and duplicate detection"""
+
+import os
+
+import pytest
+
+import file_advanced_module as fam
+
+
+@pytest.fixture
+def files():
+    return fam.AdvancedFileModule()
+
+
+def make(directory, contents):
+    """Write {name: text or bytes} into directory"""
+    for name, content in contents.items():
+        mode = 'wb' if isinstance(content, bytes) else 'w'
+        with open(directory / name, mode) as f:
+            f.write(content)
+
+
+def listing(directory):
+    """{name: text} of the regular files in directory"""
+    return {p.name: p.read_text() for p in directory.iterdir() if p.is_file() and not p.is_symlink()}
+
+
+def test_batch_rename(files, tmp_path):
+    make(tmp_path, {'a.txt': 'a', 'b.md': 'b'})
+
+    result = files.batch_rename_files({'directory': str(tmp_path), 'pattern': 'file_{}.{}'})
+
+    assert result == "Renamed 2 files"
+    renamed = listing(tmp_path)
+    assert sorted(name.split('.')[0] for name in renamed) == ['file_1', 'file_2']
+    assert sorted(renamed.values()) == ['a', 'b']
+
+
+def test_batch_rename_can_swap_names(files, tmp_path):
+    contents = {'1.txt': 'one', '2.txt': 'two'}
+    make(tmp_path, contents)
+    order = [entry.name for entry in os.scandir(tmp_path)]
+
+    files.batch_rename_files({'directory': str(tmp_path), 'pattern': '{}.{}'})
+
+    # Files are numbered in listing order; when that order is 2.txt, 1.txt the names swap
+    assert listing(tmp_path) == {f"{i}.txt": contents[name] for i, name in enumerate(order, 1)}
+
+
+def test_batch_rename_rejects_duplicate_targets(files, tmp_path):
+    make(tmp_path, {'a.txt': 'a', 'b.txt': 'b'})
+
+    result = files.batch_rename_files({'directory': str(tmp_path), 'pattern': 'same.txt'})
+
+    assert result == "Error: Pattern would give several files the same name"
+    assert listing(tmp_path) == {'a.txt': 'a', 'b.txt': 'b'}
+
+
+@pytest.mark.parametrize('occupant', ['directory', 'symlink'])
+def test_batch_rename_refuses_names_held_by_other_entries(files, tmp_path, occupant):
+    make(tmp_path, {'a.txt': 'a'})
+    if occupant == 'directory':
+        (tmp_path / 'file_1.txt').mkdir()
+    else:
+        (tmp_path / 'file_1.txt').symlink_to(tmp_path / 'a.txt')
+
+    result = files.batch_rename_files({'directory': str(tmp_path), 'pattern': 'file_{}.{}'})
+
+    assert result == f"Error: {tmp_path / 'file_1.txt'} already exists"
+    assert listing(tmp_path) == {'a.txt': 'a'}
+
+
+@pytest.mark.parametrize('failing_phase', [0, 1])
+def test_batch_rename_rolls_back_on_failure(files, tmp_path, monkeypatch, failing_phase):
+    make(tmp_path, {'a.txt': 'a', 'b.txt': 'b', 'c.txt': 'c'})
+    rename = fam._rename
+
+    def flaky(pair):
+        # Phase 0 moves to hidden temporary names, phase 1 on to the final names
+        src, dst = pair
+        if os.path.basename(src).startswith('.rename-'):
+            fail = failing_phase == 1 and dst.endswith('file_2.txt')
+        else:
+            fail = failing_phase == 0 and src.endswith('b.txt')
+        if fail:
+            raise PermissionError('denied')
+        rename(pair)
+
+    monkeypatch.setattr(fam, '_rename', flaky)
+    result = files.batch_rename_files({'directory': str(tmp_path), 'pattern': 'file_{}.{}'})
+
+    assert result.startswith("Error: Could not rename")
+    assert result.endswith("No files were renamed")
+    assert listing(tmp_path) == {'a.txt': 'a', 'b.txt': 'b', 'c.txt': 'c'}
+    assert not [name for name in os.listdir(tmp_path) if name.startswith('.rename-')]
+
+
+def test_batch_rename_reports_files_it_cannot_restore(files, tmp_path, monkeypatch):
+    make(tmp_path, {'a.txt': 'a', 'b.txt': 'b'})
+    rename = fam._rename
+
+    def flaky(pair):
+        src, dst = pair
+        if dst.endswith('file_2.txt') or src.endswith('file_1.txt'):
+            raise PermissionError('denied')
+        rename(pair)
+
+    monkeypatch.setattr(fam, '_rename', flaky)
+    result = files.batch_rename_files({'directory': str(tmp_path), 'pattern': 'file_{}.{}'})
+
+    assert "could not be restored" in result
+    stranded = result.splitlines()[-1]
+    assert stranded.startswith(str(tmp_path / 'file_1.txt'))
+    assert (tmp_path / 'file_1.txt').exists()
+
+
+def test_find_duplicate_files_groups_by_content(files, tmp_path):
+    big = os.urandom(fam._HEAD_BYTES + 1000)
+    # Same size and same first _HEAD_BYTES as big, different tail
+    big_variant = big[:-1] + bytes([big[-1] ^ 1])
+    make(tmp_path, {
+        'note.txt': 'same text',
+        'note copy.txt': 'same text',
+        'note copy 2.txt': 'same text',
+        'other.txt': 'diff text',  # same size as the notes, different content
+        'big.bin': big,
+        'big copy.bin': big,
+        'big variant.bin': big_variant,
+        'unique.txt': 'nothing else is this long',
+    })
+    (tmp_path / 'sub').mkdir()
+    make(tmp_path / 'sub', {'nested note.txt': 'same text'})
+
+    result = files.find_duplicate_files({'directory': str(tmp_path)})
+
+    assert result.startswith("Found 4 duplicate files")
+    pairs = result.split('\n\n')[1:]
+    originals = {}
+    for pair in pairs:
+        duplicate, original = (line.split(': ', 1)[1] for line in pair.strip().splitlines())
+        originals.setdefault(original, set()).add(os.path.basename(duplicate))
+    groups = sorted(sorted(dups | {os.path.basename(original)}) for original, dups in originals.items())
+    assert groups == [
+        ['big copy.bin', 'big.bin'],
+        ['nested note.txt', 'note copy 2.txt', 'note copy.txt', 'note.txt'],
+    ]
+
+
+def test_find_duplicate_files_none(files, tmp_path):
+    make(tmp_path, {'a.txt': 'one', 'b.txt': 'two!'})
+
+    assert files.find_duplicate_files({'directory': str(tmp_path)}) == "No duplicate files found"
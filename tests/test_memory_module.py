@@ -0,0 +1,92 @@
+"""MemoryModule: buffered activity logs and chat history search"""
+
+import time
+
+import pytest
+
+import memory_module as mm
+
+
+@pytest.fixture
+def memory(tmp_path):
+    return mm.MemoryModule(str(tmp_path / 'memory.db'))
+
+
+def stored_logs(memory):
+    """Rows actually written to activity_logs, bypassing the buffer"""
+    return memory.get_connection().execute('SELECT COUNT(*) FROM activity_logs').fetchone()[0]
+
+
+def test_log_activity_is_buffered_until_flush(memory):
+    memory.log_activity('open_app', {'app': 'notepad'})
+    assert stored_logs(memory) == 0
+
+    memory.flush_logs()
+    assert stored_logs(memory) == 1
+
+
+def test_reading_logs_flushes_first(memory):
+    memory.log_activity('open_app', {'app': 'notepad'})
+
+    logs = memory.get_activity_logs()
+    assert [log['action_type'] for log in logs] == ['open_app']
+    assert logs[0]['details'] == {'app': 'notepad'}
+
+
+def test_full_buffer_flushes(memory, monkeypatch):
+    monkeypatch.setattr(mm, 'LOG_FLUSH_SIZE', 5)
+    for i in range(12):
+        memory.log_activity('step', {'i': i})
+
+    assert stored_logs(memory) == 10
+    assert len(memory._log_buffer) == 2
+
+
+def test_flusher_thread_writes_after_interval(tmp_path, monkeypatch):
+    monkeypatch.setattr(mm, 'LOG_FLUSH_INTERVAL', 0.1)
+    memory = mm.MemoryModule(str(tmp_path / 'memory.db'))
+    memory.log_activity('open_app', {})
+
+    deadline = time.time() + 5
+    while stored_logs(memory) == 0 and time.time() < deadline:
+        time.sleep(0.05)
+    assert stored_logs(memory) == 1
+    assert not memory._log_pending.is_set()
+
+
+def test_bulk_logs_keep_their_order(memory):
+    memory.log_activity('first', {})
+    memory.log_activities_bulk([('second', {}), ('third', {})])
+
+    assert [log['action_type'] for log in memory.get_activity_logs()] == ['third', 'second', 'first']
+
+
+CHATS = [
+    ('user', 'Remind me to water the plants', 'en'),
+    ('assistant', 'I will remind you about the plants', 'en'),
+    ('user', 'What is the weather like?', 'en'),
+    ('user', '100% sure about "quotes"?', 'en'),
+]
+
+
+@pytest.mark.parametrize('query', ['plants', 'PLANTS', 'weather like', 'the', 'x', '100%', '"quotes"', 'missing'])
+def test_fts_search_matches_like_fallback(memory, query):
+    memory.add_chat_entries(CHATS)
+    assert memory._fts_available
+
+    with_fts = memory.search_chat_history(query)
+    memory._fts_available = False
+    with_like = memory.search_chat_history(query)
+
+    assert with_fts == with_like
+
+
+def test_fts_index_follows_updates_and_deletes(memory):
+    memory.add_chat_entries(CHATS)
+    conn = memory.get_connection()
+    conn.execute("UPDATE chat_history SET content = 'Water the garden' WHERE content LIKE '%water the plants%'")
+    conn.execute("DELETE FROM chat_history WHERE content LIKE '%weather%'")
+
+    assert [chat['content'] for chat in memory.search_chat_history('garden')] == ['Water the garden']
+    assert memory.search_chat_history('water the plants') == []
+    assert memory.search_chat_history('weather') == []
@@ -0,0 +1,19 @@
+"""The modules compiled with mypyc must stay mypy-clean"""
+
+from pathlib import Path
+
+import pytest
+
+api = pytest.importorskip('mypy.api')
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_compiled_modules_typecheck():
+    stdout, stderr, status = api.run([
+        '--config-file', str(ROOT / 'mypy.ini'),
+        '--no-incremental',
+        str(ROOT / 'ai_advanced_module.py'),
+        str(ROOT / 'automation_module.py'),
+    ])
+    assert status == 0, stdout + stderr